@@ -3,7 +3,6 @@ MT5 Trade Alerts - Main Entry Point
 """
 import asyncio
 import logging
-import signal
 import sys
 from src.services.alert_service import MT5AlertService
 from src.utils.config import Config
@@ -20,21 +19,11 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def signal_handler(service):
-    """Handle shutdown signals"""
-    def handler(signum, frame):
-        logger.info(f"Received signal {signum}")
-        service.running = False
-    return handler
-
-
 async def main():
     config = Config('config.env')
     service = MT5AlertService(config=config)
 
-    signal.signal(signal.SIGINT, signal_handler(service))
-    signal.signal(signal.SIGTERM, signal_handler(service))
-
+    # Signal handling (SIGINT/SIGTERM shutdown, SIGUSR1 level menu) is set up inside run()
     await service.run()
 
 
@@ -44,5 +33,5 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         logger.info("Service stopped by user")
     except Exception as e:
-        logger.error(f"Fatal error: {e}", exc_info=True)
+        logger.error("Fatal error: %s", e, exc_info=True)
         sys.exit(1)
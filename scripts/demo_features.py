@@ -19,7 +19,7 @@ def demo_trade_history():
     print("="*60)
     
     # Initialize database
-    db = TradeHistoryDB(db_path='demo_trade_history.db')
+    db = TradeHistoryDB(db_path='demo_trade_history.db', fast=True)
     
     # Add some sample trades
     print("\n1. Adding sample trades to database...")
@@ -106,8 +106,8 @@ def demo_trade_history():
         }
     ]
     
+    db.add_trades_bulk(sample_trades)
     for trade in sample_trades:
-        db.add_trade(trade)
         print(f"   ✓ Added trade {trade['ticket']}: {trade['symbol']} {trade['type']} - P/L: {trade['profit']:.2f}")
     
     # Add a note to one trade
@@ -153,7 +153,7 @@ def demo_charts():
     print("="*60)
     
     # Get trades from database
-    db = TradeHistoryDB(db_path='demo_trade_history.db')
+    db = TradeHistoryDB(db_path='demo_trade_history.db', fast=True)
     trades = db.get_trades()
     
     if not trades:
@@ -3,29 +3,176 @@ ML-based profit-taking suggestion analyzer
 Learns from user's trading behavior to provide personalized suggestions
 """
 import logging
-from typing import Dict, List, Optional, Tuple
+import os
+import pickle
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
-from collections import defaultdict
-import statistics
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# History window used for learning
+_LEARNING_WINDOW_DAYS = 90
+# learn_all_symbols fetches every symbol in one query, so allow more rows than the per-symbol default
+_LEARN_ALL_TRADE_LIMIT = 10000
+# Minimum time between automatic relearning passes triggered from get_suggestion
+_RELEARN_INTERVAL = timedelta(hours=1)
+# Balance used to estimate profit percentages when the real one is unavailable
+_DEFAULT_ACCOUNT_BALANCE = 10000
+# Persisted patterns older than this are dropped when the cache file is loaded
+_DEFAULT_CACHE_TTL = timedelta(days=1)
+
+# Winning-trade profit buckets used for the exit distribution (inner edges; bucket i is
+# [edge[i-1], edge[i]) with the first bucket open below and the last open above)
+_PROFIT_BIN_EDGES = np.array([10, 25, 50, 100], dtype=np.float64)
+_PROFIT_BIN_LABELS = ('0-10', '10-25', '25-50', '50-100', '100+')
+
+
+def _to_datetime64(values: List) -> np.ndarray:
+    """
+    Convert ISO timestamp strings / datetimes to a datetime64 array
+    
+    Missing or unparsable values become NaT. The whole column is parsed in one
+    call; only a column containing a bad value falls back to per-item parsing.
+    """
+    try:
+        return np.array(values, dtype='datetime64[us]')
+    except (ValueError, TypeError):
+        parsed = np.empty(len(values), dtype='datetime64[us]')
+        for i, value in enumerate(values):
+            try:
+                parsed[i] = np.datetime64(value, 'us') if value else np.datetime64('NaT')
+            except (ValueError, TypeError):
+                parsed[i] = np.datetime64('NaT')
+        return parsed
+
+
+def _median(values: np.ndarray) -> float:
+    """Median via a single np.partition (no full sort); values must be non-empty"""
+    n = values.size
+    mid = n // 2
+    if n % 2:
+        return float(np.partition(values, mid)[mid])
+    part = np.partition(values, (mid - 1, mid))
+    return float(0.5 * (part[mid - 1] + part[mid]))
+
+
+def _pattern_kernel(profit: np.ndarray, price_open: np.ndarray, price_close: np.ndarray,
+                    is_buy: np.ndarray, hold_hours: np.ndarray) -> Tuple:
+    """
+    Reduce the per-trade columns to the arrays and sums the pattern statistics need
+    
+    The winning-trade selection is applied once; every derived column (price move,
+    hold time, profit buckets) is then computed on that smaller contiguous subset
+    instead of over all trades.
+    
+    Returns:
+        Tuple of (winning_profits, profit_targets, hold_times, bucket_counts,
+        loss_sum, loss_count)
+    """
+    win_mask = profit > 0
+    winning_profits = np.ascontiguousarray(profit[win_mask])
+    
+    # Price move of each winner in its trade direction, as a percentage of the open price
+    win_open = price_open[win_mask]
+    win_close = price_close[win_mask]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        moves = np.where(is_buy[win_mask], win_close - win_open, win_open - win_close) / win_open * 100
+    profit_targets = moves[(win_open > 0) & (win_close > 0) & (moves > 0)]
+    
+    hold_times = hold_hours[win_mask]
+    hold_times = hold_times[np.isfinite(hold_times) & (hold_times > 0)]
+    
+    bucket_idx = np.searchsorted(_PROFIT_BIN_EDGES, winning_profits, side='right')
+    bucket_counts = np.bincount(bucket_idx, minlength=len(_PROFIT_BIN_LABELS))
+    
+    losing_profits = profit[profit < 0]
+    return (winning_profits, profit_targets, hold_times, bucket_counts,
+            float(losing_profits.sum()), int(losing_profits.size))
+
 
 class MLProfitAnalyzer:
     """Machine learning-based profit analyzer that learns from trade history"""
     
-    def __init__(self, trade_db, min_trades_for_learning: int = 10):
+    def __init__(self, trade_db, min_trades_for_learning: int = 10, learning_workers: int = 0,
+                 balance_provider: Optional[Callable[[], float]] = None,
+                 cache_path: Optional[str] = None, cache_ttl: timedelta = _DEFAULT_CACHE_TTL):
         """
         Initialize ML profit analyzer
         
         Args:
             trade_db: TradeHistoryDB instance
             min_trades_for_learning: Minimum number of trades needed to learn patterns
+            learning_workers: Worker processes for per-symbol analysis (0 or 1 = serial)
+            balance_provider: Optional callable returning the current account balance
+            cache_path: Optional file to persist learned patterns across restarts
+            cache_ttl: Maximum age of persisted patterns accepted on load
         """
         self.trade_db = trade_db
         self.min_trades_for_learning = min_trades_for_learning
+        self.learning_workers = learning_workers
+        self.balance_provider = balance_provider
+        self.cache_path = cache_path
+        self.cache_ttl = cache_ttl
         self.learned_patterns = {}
         self.last_analysis_time = None
+        self._trade_count_at_learn = None
+        
+        if self.cache_path:
+            self._load_cache()
+    
+    def _load_cache(self):
+        """Restore learned patterns persisted by a previous run, dropping expired entries"""
+        if not os.path.exists(self.cache_path):
+            return
+        
+        try:
+            with open(self.cache_path, 'rb') as f:
+                state = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load ML pattern cache {self.cache_path}: {e}")
+            return
+        
+        now = datetime.now()
+        self.learned_patterns = {
+            key: entry for key, entry in state.get('learned_patterns', {}).items()
+            if now - entry['last_updated'] <= self.cache_ttl
+        }
+        last_analysis_time = state.get('last_analysis_time')
+        if last_analysis_time and now - last_analysis_time <= self.cache_ttl:
+            self.last_analysis_time = last_analysis_time
+            self._trade_count_at_learn = state.get('trade_count_at_learn')
+        
+        logger.info(f"Loaded {len(self.learned_patterns)} cached ML pattern set(s)")
+    
+    def _save_cache(self):
+        """Persist learned patterns so a restart can skip cold-start learning"""
+        if not self.cache_path:
+            return
+        
+        state = {
+            'learned_patterns': self.learned_patterns,
+            'last_analysis_time': self.last_analysis_time,
+            'trade_count_at_learn': self._trade_count_at_learn
+        }
+        try:
+            directory = os.path.dirname(self.cache_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Write to a temp file first so a crash never leaves a truncated cache behind
+            tmp_path = self.cache_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            logger.warning(f"Could not save ML pattern cache {self.cache_path}: {e}")
+    
+    def ensure_learned(self):
+        """Run a learning pass unless (possibly restored) patterns are still current"""
+        if self._needs_relearn('global'):
+            self.learn_all_symbols()
     
     def learn_from_history(self, symbol: Optional[str] = None) -> Dict:
         """
@@ -39,165 +186,310 @@ class MLProfitAnalyzer:
         """
         # Get historical trades (last 90 days for learning)
         end_date = datetime.now()
-        start_date = end_date - timedelta(days=90)
+        start_date = end_date - timedelta(days=_LEARNING_WINDOW_DAYS)
         
+        trade_count = self.trade_db.trade_count()
         trades = self.trade_db.get_trades(
             start_date=start_date,
             end_date=end_date,
             symbol=symbol
         )
         
-        if len(trades) < self.min_trades_for_learning:
+        # Store patterns by symbol or globally
+        result = self._learn_from_soa(symbol or 'global', self._to_soa(trades), trade_count,
+                                      self._account_balance())
+        if result['learned']:
+            self.last_analysis_time = datetime.now()
+            self._save_cache()
+        return result
+    
+    def learn_all_symbols(self) -> Dict[str, Dict]:
+        """
+        Learn global and per-symbol patterns from a single history query
+        
+        Returns:
+            Dictionary of key ('global' or symbol) -> learn result
+        """
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=_LEARNING_WINDOW_DAYS)
+        
+        trade_count = self.trade_db.trade_count()
+        trades = self.trade_db.get_trades(
+            start_date=start_date,
+            end_date=end_date,
+            limit=_LEARN_ALL_TRADE_LIMIT
+        )
+        soa = self._to_soa(trades)
+        
+        # Group by symbol once instead of re-querying the database per symbol
+        groups = {'global': soa}
+        symbols, inverse = np.unique(soa['symbol'].astype(str), return_inverse=True)
+        for group, sym in enumerate(symbols.tolist()):
+            mask = inverse == group
+            groups[sym] = {name: col[mask] for name, col in soa.items()}
+        
+        results = {}
+        learnable = {}
+        for key, group_soa in groups.items():
+            failure = self._check_learnable(group_soa)
+            if failure:
+                results[key] = failure
+            else:
+                learnable[key] = group_soa
+        
+        # Groups are independent, so they can be analyzed in parallel
+        patterns_by_key = self._analyze_groups(learnable, self._account_balance())
+        
+        # A full pass rebuilds the cache so symbols that no longer qualify are dropped
+        self.learned_patterns.clear()
+        for key, group_soa in learnable.items():
+            results[key] = self._store_patterns(key, group_soa, patterns_by_key[key], trade_count)
+        
+        # Record the attempt even if nothing was learned so callers don't re-query every tick
+        self.last_analysis_time = datetime.now()
+        self._trade_count_at_learn = trade_count
+        self._save_cache()
+        return results
+    
+    def invalidate(self, symbol: Optional[str] = None):
+        """
+        Drop cached patterns so the next suggestion relearns them
+        
+        Args:
+            symbol: Symbol to invalidate (None = everything)
+        """
+        if symbol is None:
+            self.learned_patterns.clear()
+        else:
+            self.learned_patterns.pop(symbol, None)
+        self.last_analysis_time = None
+        self._trade_count_at_learn = None
+    
+    def _learn_from_soa(self, key: str, soa: Dict[str, np.ndarray], trade_count: int,
+                        account_balance: float) -> Dict:
+        """
+        Analyze one group of trades and store the patterns under key
+        
+        Args:
+            key: Cache key ('global' or symbol)
+            soa: Column arrays as returned by _to_soa()
+            trade_count: Database trade count when the trades were fetched
+            account_balance: Balance used for profit percentages
+        
+        Returns:
+            Learn result dictionary
+        """
+        failure = self._check_learnable(soa)
+        if failure:
+            return failure
+        return self._store_patterns(key, soa, self._analyze_patterns(soa, account_balance), trade_count)
+    
+    def _account_balance(self) -> float:
+        """Get the balance for profit percentages, falling back to a default when unavailable"""
+        if self.balance_provider:
+            try:
+                balance = self.balance_provider()
+                if balance and balance > 0:
+                    return float(balance)
+            except Exception as e:
+                logger.warning(f"Could not get account balance for ML analysis: {e}")
+        return _DEFAULT_ACCOUNT_BALANCE
+    
+    def _check_learnable(self, soa: Dict[str, np.ndarray]) -> Optional[Dict]:
+        """Return a 'not learned' result if the group has too little history, else None"""
+        profit = soa['profit']
+        trades_analyzed = int(profit.size)
+        
+        if trades_analyzed < self.min_trades_for_learning:
             return {
                 'learned': False,
-                'reason': f'Insufficient trades ({len(trades)} < {self.min_trades_for_learning})',
-                'trades_analyzed': len(trades)
+                'reason': f'Insufficient trades ({trades_analyzed} < {self.min_trades_for_learning})',
+                'trades_analyzed': trades_analyzed
             }
         
         # Analyze winning trades to learn exit patterns
-        winning_trades = [t for t in trades if t.get('profit', 0) > 0]
-        losing_trades = [t for t in trades if t.get('profit', 0) < 0]
-        
-        if len(winning_trades) < 3:
+        winning_count = int(np.count_nonzero(profit > 0))
+        if winning_count < 3:
             return {
                 'learned': False,
-                'reason': f'Insufficient winning trades ({len(winning_trades)} < 3)',
-                'trades_analyzed': len(trades)
+                'reason': f'Insufficient winning trades ({winning_count} < 3)',
+                'trades_analyzed': trades_analyzed
             }
         
-        patterns = self._analyze_patterns(winning_trades, losing_trades, trades)
+        return None
+    
+    def _store_patterns(self, key: str, soa: Dict[str, np.ndarray], patterns: Dict,
+                        trade_count: int) -> Dict:
+        """Cache analyzed patterns under key and build the learn result"""
+        profit = soa['profit']
+        trades_analyzed = int(profit.size)
+        winning_count = int(np.count_nonzero(profit > 0))
+        losing_count = int(np.count_nonzero(profit < 0))
         
-        # Store patterns by symbol or globally
-        key = symbol or 'global'
         self.learned_patterns[key] = {
             'patterns': patterns,
+            'triggers': self._build_triggers(patterns),
             'last_updated': datetime.now(),
-            'trades_analyzed': len(trades),
-            'winning_trades': len(winning_trades),
-            'losing_trades': len(losing_trades)
+            'trades_analyzed': trades_analyzed,
+            'winning_trades': winning_count,
+            'losing_trades': losing_count,
+            'trade_count_at_learn': trade_count
         }
         
-        self.last_analysis_time = datetime.now()
-        
         return {
             'learned': True,
             'patterns': patterns,
-            'trades_analyzed': len(trades),
-            'winning_trades': len(winning_trades),
-            'losing_trades': len(losing_trades)
+            'trades_analyzed': trades_analyzed,
+            'winning_trades': winning_count,
+            'losing_trades': losing_count
         }
     
-    def _analyze_patterns(self, winning_trades: List[Dict], 
-                         losing_trades: List[Dict], 
-                         all_trades: List[Dict]) -> Dict:
-        """Analyze patterns from trade data"""
+    @staticmethod
+    def _build_triggers(patterns: Dict) -> Dict[str, float]:
+        """
+        Precompute the lowest price move / profit at which get_suggestion can recommend anything
+        
+        A trigger whose learned average is not positive can never fire, so it is set to infinity.
+        """
+        avg_profit_target = patterns.get('avg_profit_target_pct', 0)
+        avg_winning_profit = patterns.get('avg_winning_profit', 0)
+        return {
+            'min_pct': avg_profit_target * 0.8 if avg_profit_target > 0 else float('inf'),
+            'min_profit': avg_winning_profit * 0.9 if avg_winning_profit > 0 else float('inf')
+        }
+    
+    def _analyze_groups(self, groups: Dict[str, Dict[str, np.ndarray]],
+                        account_balance: float) -> Dict[str, Dict]:
+        """
+        Run pattern analysis for several independent trade groups
+        
+        Groups are analyzed in a process pool when learning_workers > 1, falling
+        back to serial analysis if the pool cannot be used.
+        
+        Args:
+            groups: Dictionary of key -> column arrays
+            account_balance: Balance used for profit percentages
+        
+        Returns:
+            Dictionary of key -> patterns
+        """
+        if self.learning_workers > 1 and len(groups) > 1:
+            try:
+                results = {}
+                with ProcessPoolExecutor(max_workers=min(self.learning_workers, len(groups))) as pool:
+                    futures = {pool.submit(self._analyze_patterns, soa, account_balance): key for key, soa in groups.items()}
+                    for future in as_completed(futures):
+                        results[futures[future]] = future.result()
+                return results
+            except Exception as e:
+                logger.warning(f"Parallel pattern analysis failed, falling back to serial: {e}")
+        
+        return {key: self._analyze_patterns(soa, account_balance) for key, soa in groups.items()}
+    
+    @staticmethod
+    def _to_soa(trades: List[Dict]) -> Dict[str, np.ndarray]:
+        """
+        Convert a list of trade dicts into parallel column arrays
+        
+        Args:
+            trades: Trade dictionaries as returned by TradeHistoryDB
+        
+        Returns:
+            Dictionary of column name -> np.ndarray, one entry per trade
+        """
+        return {
+            'profit': np.fromiter((t.get('profit') or 0.0 for t in trades), dtype=np.float64, count=len(trades)),
+            'price_open': np.fromiter((t.get('price_open') or 0.0 for t in trades), dtype=np.float64, count=len(trades)),
+            'price_close': np.fromiter((t.get('price_close') or 0.0 for t in trades), dtype=np.float64, count=len(trades)),
+            'is_buy': np.fromiter((t.get('type', 'BUY') == 'BUY' for t in trades), dtype=bool, count=len(trades)),
+            'symbol': np.array([t.get('symbol', 'UNKNOWN') for t in trades], dtype=object),
+            'time_open': _to_datetime64([t.get('time_open') for t in trades]),
+            'time_close': _to_datetime64([t.get('time_close') for t in trades]),
+        }
+    
+    @staticmethod
+    def _analyze_patterns(soa: Dict[str, np.ndarray],
+                          account_balance: float = _DEFAULT_ACCOUNT_BALANCE) -> Dict:
+        """Analyze patterns from trade column arrays (static so it can run in a worker process)"""
         patterns = {}
         
-        # 1. Average profit at exit for winning trades
-        winning_profits = [t.get('profit', 0) for t in winning_trades]
-        patterns['avg_winning_profit'] = statistics.mean(winning_profits) if winning_profits else 0
-        patterns['median_winning_profit'] = statistics.median(winning_profits) if winning_profits else 0
+        profit = soa['profit']
+        hold_hours = (soa['time_close'] - soa['time_open']) / np.timedelta64(1, 'h')  # NaN where unparsable
+        (winning_profits, profit_targets, hold_times,
+         bucket_counts, loss_sum, loss_count) = _pattern_kernel(
+            profit, soa['price_open'], soa['price_close'], soa['is_buy'], hold_hours)
         
+        # 1. Average profit at exit for winning trades
         # 2. Profit percentage patterns
-        account_balance = 10000  # Default, will be adjusted if available
-        profit_percentages = []
-        for trade in winning_trades:
-            profit = trade.get('profit', 0)
-            if profit > 0:
-                # Estimate profit percentage (simplified)
-                profit_percentages.append(profit / account_balance * 100)
-        
-        patterns['avg_profit_percentage'] = statistics.mean(profit_percentages) if profit_percentages else 0
-        patterns['median_profit_percentage'] = statistics.median(profit_percentages) if profit_percentages else 0
+        if winning_profits.size:
+            avg_win = float(winning_profits.mean())
+            median_win = _median(winning_profits)
+            patterns['avg_winning_profit'] = avg_win
+            patterns['median_winning_profit'] = median_win
+            # Estimate profit percentage (simplified); scaling commutes with mean/median
+            patterns['avg_profit_percentage'] = avg_win / account_balance * 100
+            patterns['median_profit_percentage'] = median_win / account_balance * 100
+        else:
+            patterns['avg_winning_profit'] = 0
+            patterns['median_winning_profit'] = 0
+            patterns['avg_profit_percentage'] = 0
+            patterns['median_profit_percentage'] = 0
         
         # 3. Hold time patterns for winning trades
-        hold_times = []
-        for trade in winning_trades:
-            time_open = trade.get('time_open')
-            time_close = trade.get('time_close')
-            if time_open and time_close:
-                try:
-                    if isinstance(time_open, str):
-                        open_dt = datetime.fromisoformat(time_open.replace(' ', 'T'))
-                    else:
-                        open_dt = time_open
-                    
-                    if isinstance(time_close, str):
-                        close_dt = datetime.fromisoformat(time_close.replace(' ', 'T'))
-                    else:
-                        close_dt = time_close
-                    
-                    hold_time = (close_dt - open_dt).total_seconds() / 3600  # Hours
-                    if hold_time > 0:
-                        hold_times.append(hold_time)
-                except:
-                    pass
-        
-        patterns['avg_hold_time_hours'] = statistics.mean(hold_times) if hold_times else 0
-        patterns['median_hold_time_hours'] = statistics.median(hold_times) if hold_times else 0
+        patterns['avg_hold_time_hours'] = float(hold_times.mean()) if hold_times.size else 0
+        patterns['median_hold_time_hours'] = _median(hold_times) if hold_times.size else 0
         
         # 4. Profit target patterns (analyze price movements)
-        profit_targets = []
-        for trade in winning_trades:
-            price_open = trade.get('price_open', 0)
-            price_close = trade.get('price_close', 0)
-            trade_type = trade.get('type', 'BUY')
-            
-            if price_open > 0 and price_close > 0:
-                if trade_type == 'BUY':
-                    price_move_pct = ((price_close - price_open) / price_open) * 100
-                else:  # SELL
-                    price_move_pct = ((price_open - price_close) / price_open) * 100
-                
-                if price_move_pct > 0:
-                    profit_targets.append(price_move_pct)
-        
-        patterns['avg_profit_target_pct'] = statistics.mean(profit_targets) if profit_targets else 0
-        patterns['median_profit_target_pct'] = statistics.median(profit_targets) if profit_targets else 0
+        patterns['avg_profit_target_pct'] = float(profit_targets.mean()) if profit_targets.size else 0
+        patterns['median_profit_target_pct'] = _median(profit_targets) if profit_targets.size else 0
         
         # 5. Optimal exit timing (when do you typically close winners?)
         # Analyze profit distribution at exit
-        profit_ranges = defaultdict(int)
-        for trade in winning_trades:
-            profit = trade.get('profit', 0)
-            if profit < 10:
-                profit_ranges['0-10'] += 1
-            elif profit < 25:
-                profit_ranges['10-25'] += 1
-            elif profit < 50:
-                profit_ranges['25-50'] += 1
-            elif profit < 100:
-                profit_ranges['50-100'] += 1
-            else:
-                profit_ranges['100+'] += 1
-        
-        patterns['profit_distribution'] = dict(profit_ranges)
+        patterns['profit_distribution'] = {
+            label: int(count) for label, count in zip(_PROFIT_BIN_LABELS, bucket_counts) if count
+        }
         
         # 6. Risk-reward patterns
-        avg_loss = abs(statistics.mean([t.get('profit', 0) for t in losing_trades])) if losing_trades else 0
+        avg_loss = abs(loss_sum / loss_count) if loss_count else 0
         avg_win = patterns['avg_winning_profit']
         patterns['risk_reward_ratio'] = avg_win / avg_loss if avg_loss > 0 else 0
         
         # 7. Symbol-specific patterns
-        symbol_patterns = defaultdict(lambda: {'wins': [], 'losses': []})
-        for trade in all_trades:
-            sym = trade.get('symbol', 'UNKNOWN')
-            if trade.get('profit', 0) > 0:
-                symbol_patterns[sym]['wins'].append(trade.get('profit', 0))
-            else:
-                symbol_patterns[sym]['losses'].append(abs(trade.get('profit', 0)))
-        
-        patterns['symbol_performance'] = {}
-        for sym, data in symbol_patterns.items():
-            if data['wins']:
-                patterns['symbol_performance'][sym] = {
-                    'avg_win': statistics.mean(data['wins']),
-                    'win_count': len(data['wins']),
-                    'loss_count': len(data['losses'])
-                }
+        # Factorize symbols once, then aggregate every group in a single bincount pass
+        symbols, codes = np.unique(soa['symbol'].astype(str), return_inverse=True)
+        win_mask = profit > 0
+        win_sums = np.bincount(codes, weights=np.where(win_mask, profit, 0.0), minlength=len(symbols))
+        win_counts = np.bincount(codes[win_mask], minlength=len(symbols))
+        loss_counts = np.bincount(codes[~win_mask], minlength=len(symbols))
+        
+        patterns['symbol_performance'] = {
+            sym: {
+                'avg_win': float(win_sums[i] / win_counts[i]),
+                'win_count': int(win_counts[i]),
+                'loss_count': int(loss_counts[i])
+            }
+            for i, sym in enumerate(symbols.tolist()) if win_counts[i]
+        }
         
         return patterns
     
+    def _needs_relearn(self, key: str) -> bool:
+        """
+        Check whether patterns for key are missing or out of date
+        
+        Cached patterns stay valid until the relearn interval passes or new trades
+        are recorded. Keys that could not be learned fall back to the last pass.
+        """
+        meta = self.learned_patterns.get(key)
+        if meta is not None:
+            learned_at, count_at_learn = meta['last_updated'], meta['trade_count_at_learn']
+        else:
+            learned_at, count_at_learn = self.last_analysis_time, self._trade_count_at_learn
+        
+        if learned_at is None or datetime.now() - learned_at >= _RELEARN_INTERVAL:
+            return True
+        return self.trade_db.trade_count() != count_at_learn
+    
     def get_suggestion(self, position: Dict, symbol: Optional[str] = None) -> Optional[Dict]:
         """
         Get ML-based profit-taking suggestion for a position
@@ -212,14 +504,15 @@ class MLProfitAnalyzer:
         # Check if we have learned patterns
         key = symbol or position.get('symbol') or 'global'
         
-        if key not in self.learned_patterns:
-            # Try to learn if we haven't yet
-            self.learn_from_history(symbol=key)
+        if self._needs_relearn(key):
+            # Relearn when stale or new trades arrived - one query covers every symbol
+            self.learn_all_symbols()
         
         if key not in self.learned_patterns:
             return None
         
-        patterns = self.learned_patterns[key]['patterns']
+        entry = self.learned_patterns[key]
+        patterns = entry['patterns']
         
         current_profit = position.get('profit', 0)
         if current_profit <= 0:
@@ -240,58 +533,70 @@ class MLProfitAnalyzer:
         else:  # SELL
             price_move_pct = ((price_open - price_current) / price_open) * 100
         
+        # Below both learned trigger thresholds nothing below can recommend a close
+        triggers = entry['triggers']
+        if price_move_pct < triggers['min_pct'] and current_profit < triggers['min_profit']:
+            return None
+        
         # Compare with learned patterns
         avg_profit_target = patterns.get('avg_profit_target_pct', 0)
         median_profit_target = patterns.get('median_profit_target_pct', 0)
         
-        # Determine suggestion based on learned behavior
-        suggestion = {
-            'ticket': position.get('ticket'),
-            'symbol': position.get('symbol'),
-            'type': position_type,
-            'current_profit': current_profit,
-            'current_profit_pct': price_move_pct,
-            'learned_avg_target': avg_profit_target,
-            'learned_median_target': median_profit_target,
-            'confidence': 'low',
-            'recommendation': 'hold',
-            'volume_to_close': 0,
-            'reason': ''
-        }
+        # Determine suggestion based on learned behavior; the result dict is only built
+        # when something other than 'hold' is recommended
+        confidence = 'low'
+        recommendation = 'hold'
+        volume_to_close = 0
+        reason = ''
         
         # Decision logic based on learned patterns
         if avg_profit_target > 0:
             # If current profit is close to or exceeds learned average
             if price_move_pct >= avg_profit_target * 0.8:
-                suggestion['confidence'] = 'high'
-                suggestion['recommendation'] = 'partial_close'
+                confidence = 'high'
+                recommendation = 'partial_close'
                 # Suggest closing based on how much profit we've captured
                 if price_move_pct >= avg_profit_target:
                     # At or above average target - suggest closing 50-70%
-                    suggestion['volume_to_close'] = round(volume * 0.6, 2)
-                    suggestion['reason'] = f'Profit ({price_move_pct:.2f}%) matches your average exit target ({avg_profit_target:.2f}%)'
+                    volume_to_close = round(volume * 0.6, 2)
+                    reason = f'Profit ({price_move_pct:.2f}%) matches your average exit target ({avg_profit_target:.2f}%)'
                 else:
                     # Approaching target - suggest closing 30-50%
-                    suggestion['volume_to_close'] = round(volume * 0.4, 2)
-                    suggestion['reason'] = f'Profit ({price_move_pct:.2f}%) approaching your average exit target ({avg_profit_target:.2f}%)'
+                    volume_to_close = round(volume * 0.4, 2)
+                    reason = f'Profit ({price_move_pct:.2f}%) approaching your average exit target ({avg_profit_target:.2f}%)'
             
             # If significantly above average, suggest larger close
             elif price_move_pct >= avg_profit_target * 1.5:
-                suggestion['confidence'] = 'very_high'
-                suggestion['recommendation'] = 'large_partial_close'
-                suggestion['volume_to_close'] = round(volume * 0.75, 2)
-                suggestion['reason'] = f'Profit ({price_move_pct:.2f}%) significantly exceeds your average target ({avg_profit_target:.2f}%) - consider securing profits'
+                confidence = 'very_high'
+                recommendation = 'large_partial_close'
+                volume_to_close = round(volume * 0.75, 2)
+                reason = f'Profit ({price_move_pct:.2f}%) significantly exceeds your average target ({avg_profit_target:.2f}%) - consider securing profits'
         
         # Also check profit amount patterns
         avg_winning_profit = patterns.get('avg_winning_profit', 0)
         if avg_winning_profit > 0 and current_profit >= avg_winning_profit * 0.9:
-            if suggestion['recommendation'] == 'hold':
-                suggestion['confidence'] = 'medium'
-                suggestion['recommendation'] = 'partial_close'
-                suggestion['volume_to_close'] = round(volume * 0.5, 2)
-                suggestion['reason'] = f'Profit amount ({current_profit:.2f}) matches your typical winning trade average ({avg_winning_profit:.2f})'
+            if recommendation == 'hold':
+                confidence = 'medium'
+                recommendation = 'partial_close'
+                volume_to_close = round(volume * 0.5, 2)
+                reason = f'Profit amount ({current_profit:.2f}) matches your typical winning trade average ({avg_winning_profit:.2f})'
         
-        return suggestion if suggestion['recommendation'] != 'hold' else None
+        if recommendation == 'hold':
+            return None
+        
+        return {
+            'ticket': position.get('ticket'),
+            'symbol': position.get('symbol'),
+            'type': position_type,
+            'current_profit': current_profit,
+            'current_profit_pct': price_move_pct,
+            'learned_avg_target': avg_profit_target,
+            'learned_median_target': median_profit_target,
+            'confidence': confidence,
+            'recommendation': recommendation,
+            'volume_to_close': volume_to_close,
+            'reason': reason
+        }
     
     def get_insights(self, symbol: Optional[str] = None) -> Dict:
         """
@@ -13,15 +13,38 @@ logger = logging.getLogger(__name__)
 class TradeHistoryDB:
     """SQLite database for storing trade history"""
     
-    def __init__(self, db_path: str = 'trade_history.db'):
+    def __init__(self, db_path: str = 'trade_history.db', fast: bool = False):
+        """
+        Args:
+            db_path: Path to the SQLite database file
+            fast: Keep the rollback journal in memory instead of on disk; only for throwaway
+                databases (e.g. demos), since a crash mid-write can corrupt the file
+        """
         self.db_path = db_path
+        self.fast = fast
         self._init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the write-path settings applied"""
+        conn = sqlite3.connect(self.db_path)
+        # Per-connection settings: fsync at WAL checkpoints rather than every commit, and keep
+        # temporary tables/indices in RAM
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        if self.fast:
+            conn.execute('PRAGMA journal_mode=MEMORY')
+        return conn
+    
     def _init_database(self):
         """Initialize database schema"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
+        # Write-ahead logging is stored in the database file, so setting it once covers
+        # every later connection
+        if not self.fast:
+            cursor.execute('PRAGMA journal_mode=WAL')
+        
         # Trades table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS trades (
@@ -67,7 +90,7 @@ class TradeHistoryDB:
             True if successful, False otherwise
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             # Check if trade already exists
@@ -130,6 +153,59 @@ class TradeHistoryDB:
             logger.error(f"Error adding trade to database: {e}")
             return False
     
+    def add_trades_bulk(self, trades: List[Dict]) -> bool:
+        """
+        Add or update many trades in a single transaction
+        
+        Same insert-or-update semantics as add_trade, but all rows go through one
+        executemany and one commit instead of a connection and commit per trade.
+        
+        Args:
+            trades: List of trade dictionaries (see add_trade)
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        rows = ((
+            trade_data.get('ticket'),
+            trade_data.get('symbol'),
+            trade_data.get('type'),
+            trade_data.get('volume'),
+            trade_data.get('price_open'),
+            trade_data.get('price_close'),
+            trade_data.get('profit', 0),
+            trade_data.get('commission', 0),
+            trade_data.get('swap', 0),
+            trade_data.get('time_open'),
+            trade_data.get('time_close'),
+            trade_data.get('duration_seconds'),
+            trade_data.get('sl'),
+            trade_data.get('tp')
+        ) for trade_data in trades)
+        
+        try:
+            conn = self._connect()
+            with conn:
+                conn.executemany('''
+                    INSERT INTO trades (
+                        ticket, symbol, type, volume, price_open, price_close,
+                        profit, commission, swap, time_open, time_close,
+                        duration_seconds, sl, tp
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(ticket) DO UPDATE SET
+                        symbol = excluded.symbol, type = excluded.type, volume = excluded.volume,
+                        price_open = excluded.price_open, price_close = excluded.price_close,
+                        profit = excluded.profit, commission = excluded.commission,
+                        swap = excluded.swap, time_open = excluded.time_open,
+                        time_close = excluded.time_close, duration_seconds = excluded.duration_seconds,
+                        sl = excluded.sl, tp = excluded.tp, updated_at = CURRENT_TIMESTAMP
+                ''', rows)
+            conn.close()
+            return True
+        except Exception as e:
+            logger.error(f"Error adding trades to database: {e}")
+            return False
+    
     def add_trade_note(self, ticket: int, note: str) -> bool:
         """
         Add or update notes for a trade
@@ -142,7 +218,7 @@ class TradeHistoryDB:
             True if successful, False otherwise
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -160,7 +236,7 @@ class TradeHistoryDB:
     def get_trade(self, ticket: int) -> Optional[Dict]:
         """Get a specific trade by ticket"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
@@ -175,6 +251,21 @@ class TradeHistoryDB:
             logger.error(f"Error getting trade: {e}")
             return None
     
+    def trade_count(self) -> int:
+        """Get the total number of stored trades (used to detect new trades cheaply)"""
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT COUNT(*) FROM trades')
+            count = cursor.fetchone()[0]
+            conn.close()
+            
+            return count
+        except Exception as e:
+            logger.error(f"Error counting trades: {e}")
+            return -1
+    
     def get_trades(self, start_date: Optional[datetime] = None, 
                    end_date: Optional[datetime] = None,
                    symbol: Optional[str] = None,
@@ -192,7 +283,7 @@ class TradeHistoryDB:
             List of trade dictionaries
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
@@ -232,7 +323,7 @@ class TradeHistoryDB:
             Dictionary with statistics
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             query = '''
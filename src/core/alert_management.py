@@ -1,7 +1,11 @@
 """
 Alert Management - Core classes for rate limiting, grouping, and quiet hours
 """
+import array
+import heapq
+import itertools
 import logging
+import time as _time
 from datetime import datetime, time
 from collections import defaultdict, deque
 from typing import Dict, List
@@ -9,38 +13,72 @@ from typing import Dict, List
 logger = logging.getLogger(__name__)
 
 
+class _TimestampRing:
+    """
+    Fixed-capacity ring of the most recent monotonic_ns() timestamps
+    
+    Keeping only the newest `capacity` entries is enough for a rate limit: the window holds
+    `capacity` or more events exactly when the oldest kept entry is still inside it.
+    """
+    __slots__ = ('_buf', '_capacity', '_head', '_count')
+    
+    def __init__(self, capacity: int):
+        self._buf = array.array('q', bytes(8 * capacity))
+        self._capacity = capacity
+        self._head = 0  # Index of the oldest kept timestamp
+        self._count = 0
+    
+    def is_full(self, now_ns: int, window_ns: int) -> bool:
+        """Drop timestamps older than the window, then report whether capacity is reached"""
+        buf = self._buf
+        capacity = self._capacity
+        while self._count and now_ns - buf[self._head] > window_ns:
+            self._head = (self._head + 1) % capacity
+            self._count -= 1
+        return self._count >= capacity
+    
+    def append(self, now_ns: int):
+        """Record a timestamp, overwriting the oldest once at capacity"""
+        capacity = self._capacity
+        if not capacity:
+            return
+        if self._count < capacity:
+            self._buf[(self._head + self._count) % capacity] = now_ns
+            self._count += 1
+        else:
+            self._buf[self._head] = now_ns
+            self._head = (self._head + 1) % capacity
+
+
+_MINUTE_NS = 60 * 1_000_000_000
+_HOUR_NS = 3600 * 1_000_000_000
+
+
 class AlertRateLimiter:
     """Rate limiter to prevent alert spam"""
     def __init__(self, max_alerts_per_minute: int = 10, max_alerts_per_hour: int = 100):
         self.max_per_minute = max_alerts_per_minute
         self.max_per_hour = max_alerts_per_hour
-        self.minute_alerts = deque()  # Timestamps of alerts in last minute
-        self.hour_alerts = deque()    # Timestamps of alerts in last hour
+        self._minute_alerts = _TimestampRing(max(max_alerts_per_minute, 0))  # Alerts in last minute
+        self._hour_alerts = _TimestampRing(max(max_alerts_per_hour, 0))      # Alerts in last hour
     
     def can_send_alert(self) -> bool:
         """Check if an alert can be sent based on rate limits"""
-        now = datetime.now()
-        
-        # Remove old alerts outside the time windows
-        while self.minute_alerts and (now - self.minute_alerts[0]).total_seconds() > 60:
-            self.minute_alerts.popleft()
-        
-        while self.hour_alerts and (now - self.hour_alerts[0]).total_seconds() > 3600:
-            self.hour_alerts.popleft()
+        now = _time.monotonic_ns()
         
-        # Check limits
-        if len(self.minute_alerts) >= self.max_per_minute:
+        # Expire old alerts and check limits
+        if self._minute_alerts.is_full(now, _MINUTE_NS):
             return False
-        if len(self.hour_alerts) >= self.max_per_hour:
+        if self._hour_alerts.is_full(now, _HOUR_NS):
             return False
         
         return True
     
     def record_alert(self):
         """Record that an alert was sent"""
-        now = datetime.now()
-        self.minute_alerts.append(now)
-        self.hour_alerts.append(now)
+        now = _time.monotonic_ns()
+        self._minute_alerts.append(now)
+        self._hour_alerts.append(now)
 
 
 class AlertGrouper:
@@ -48,8 +86,11 @@ class AlertGrouper:
     def __init__(self, batch_window_seconds: int = 30, max_batch_size: int = 10):
         self.batch_window = batch_window_seconds
         self.max_batch_size = max_batch_size
-        self.pending_alerts = defaultdict(list)  # alert_type -> list of alerts
+        self.pending_alerts = defaultdict(deque)  # alert_type -> alerts, oldest first
         self.last_batch_time = defaultdict(lambda: datetime.now())
+        # Min-heap of (expiry, seq, alert_type, alert) so stale alerts are evicted on insert
+        self._expiry_heap = []
+        self._seq = itertools.count()
     
     def add_alert(self, alert_type: str, alert_data: Dict) -> bool:
         """
@@ -58,10 +99,15 @@ class AlertGrouper:
         Returns:
             True if batch should be sent, False if waiting for more
         """
-        self.pending_alerts[alert_type].append({
+        self._evict_expired()
+        
+        alert = {
             'data': alert_data,
             'timestamp': datetime.now()
-        })
+        }
+        self.pending_alerts[alert_type].append(alert)
+        heapq.heappush(self._expiry_heap, (_time.monotonic() + self.batch_window * 2,
+                                           next(self._seq), alert_type, alert))
         
         now = datetime.now()
         time_since_last_batch = (now - self.last_batch_time[alert_type]).total_seconds()
@@ -77,19 +123,25 @@ class AlertGrouper:
     
     def get_batch(self, alert_type: str) -> List[Dict]:
         """Get and clear the batch for an alert type"""
-        batch = self.pending_alerts[alert_type].copy()
+        batch = list(self.pending_alerts[alert_type])
         self.pending_alerts[alert_type].clear()
         self.last_batch_time[alert_type] = datetime.now()
         return batch
     
+    def _evict_expired(self):
+        """Drop alerts that have been pending for more than two batch windows"""
+        now = _time.monotonic()
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            _, _, alert_type, alert = heapq.heappop(heap)
+            pending = self.pending_alerts[alert_type]
+            # Alerts of one type expire in insertion order; anything else was already batched
+            if pending and pending[0] is alert:
+                pending.popleft()
+    
     def clear_old_alerts(self):
         """Clear alerts older than batch window"""
-        now = datetime.now()
-        for alert_type in list(self.pending_alerts.keys()):
-            self.pending_alerts[alert_type] = [
-                alert for alert in self.pending_alerts[alert_type]
-                if (now - alert['timestamp']).total_seconds() < self.batch_window * 2
-            ]
+        self._evict_expired()
 
 
 class QuietHours:
@@ -1,11 +1,138 @@
 import MetaTrader5 as mt5
+import asyncio
+import functools
+import itertools
+import operator
+import threading
 import time
-from typing import Dict, List, Optional, Callable
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Collection, Dict, Iterator, List, Optional, Callable, Union
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 import logging
 
+import numpy as np
+
+from ..utils.config import LevelsArray, LEVEL_ABOVE, LEVEL_BELOW, LEVEL_BOTH
+
 logger = logging.getLogger(__name__)
 
+# Connection shared between the running service and utilities such as the level manager
+_shared_monitor = None
+
+# How long a positions/orders snapshot may be reused before it is fetched again (seconds)
+SNAPSHOT_MAX_AGE = 0.1
+# How long the account balance may be reused before account_info() is queried again (seconds)
+BALANCE_MAX_AGE = 1.0
+# Upper bound on tracked positions/orders; the oldest records are dropped beyond it so tickets
+# that were never seen closing (e.g. skipped by symbol-filtered polls) cannot accumulate forever
+MAX_TRACKED = 10000
+
+# Order type display names indexed by the MT5 ORDER_TYPE_* value (BUY=0 ... SELL_STOP_LIMIT=7)
+# Position types (POSITION_TYPE_BUY=0, POSITION_TYPE_SELL=1) index the same tuple
+_ORDER_TYPE_NAMES = (
+    'BUY', 'SELL', 'BUY LIMIT', 'SELL LIMIT',
+    'BUY STOP', 'SELL STOP', 'BUY STOP LIMIT', 'SELL STOP LIMIT'
+)
+
+# Deal enum values bound once so per-deal loops skip the module attribute lookup
+_DEAL_IN = mt5.DEAL_ENTRY_IN
+_DEAL_OUT = mt5.DEAL_ENTRY_OUT
+_DEAL_BUY = mt5.DEAL_TYPE_BUY
+
+# Batch field extraction for positions/orders: one C call instead of a LOAD_ATTR per field
+_POS_ATTRS = operator.attrgetter('ticket', 'symbol', 'type', 'volume', 'price_open', 'price_current',
+                                 'profit', 'time')
+_ORD_ATTRS = operator.attrgetter('ticket', 'symbol', 'type', 'volume_initial', 'price_open',
+                                 'price_current', 'time_setup', 'time_expiration')
+# Single-field getters for building NumPy columns with np.fromiter(map(...))
+_PROFIT = operator.attrgetter('profit')
+_VOLUME = operator.attrgetter('volume')
+_PRICE_OPEN = operator.attrgetter('price_open')
+_POSITION_ID = operator.attrgetter('position_id')
+_ENTRY = operator.attrgetter('entry')
+# Numeric deal fields get_trade_statistics aggregates, in column order
+_DEAL_STAT_ATTRS = operator.attrgetter('position_id', 'entry', 'profit', 'commission', 'swap', 'volume')
+
+
+@functools.lru_cache(maxsize=4096)
+def _fmt_ts(timestamp: int) -> str:
+    """
+    Format an MT5 epoch timestamp as local 'YYYY-MM-DD HH:MM:SS' without building a datetime
+    
+    Cached because open positions and orders keep the same open/setup time from poll to poll.
+    """
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))
+
+
+def _fmt_duration(entry_time: Optional[int], exit_time: Optional[int]) -> Optional[str]:
+    """Format the time between two epoch timestamps as 'H:MM:SS' (timedelta style), or None"""
+    if entry_time is None or exit_time is None:
+        return None
+    return str(timedelta(seconds=exit_time - entry_time))
+
+
+def _order_type_name(order_type: int, default: str = 'UNKNOWN') -> str:
+    """Map an MT5 order type to its display name with a plain tuple index"""
+    return _ORDER_TYPE_NAMES[order_type] if 0 <= order_type < len(_ORDER_TYPE_NAMES) else default
+
+
+def _build_groups(levels: List[Dict]) -> Dict[str, Dict]:
+    """Group level dicts by their 'group' identifier (see check_level_groups)"""
+    groups = {}
+    for level in levels:
+        group_id = level.get('group')
+        if group_id:
+            group = groups.get(group_id)
+            if group is None:
+                group = groups[group_id] = {
+                    'levels': [],
+                    'required_count': level.get('group_required_count', 2),  # Default: 2 levels
+                    'description': level.get('group_description', f'Group {group_id}')
+                }
+            group['levels'].append(level)
+    return groups
+
+
+@dataclass
+class _PosRec:
+    """Tracked state of an open position (slotted to avoid a dict per position)"""
+    __slots__ = ('ticket', 'symbol', 'type', 'volume', 'price_open', 'price_current', 'profit', 'time',
+                 'seen_gen')
+    ticket: int
+    symbol: str
+    type: int
+    volume: float
+    price_open: float
+    price_current: float
+    profit: float
+    time: int
+    seen_gen: int  # Poll generation in which the position was last seen open
+    
+    @classmethod
+    def from_position(cls, pos, seen_gen: int = 0) -> '_PosRec':
+        return cls(*_POS_ATTRS(pos), seen_gen)
+
+
+@dataclass
+class _OrdRec:
+    """Tracked state of a pending order (slotted like _PosRec)"""
+    __slots__ = ('ticket', 'symbol', 'type', 'volume', 'price_open', 'price_current', 'time_setup',
+                 'time_expiration', 'seen_gen')
+    ticket: int
+    symbol: str
+    type: int
+    volume: float
+    price_open: float
+    price_current: float
+    time_setup: int
+    time_expiration: int
+    seen_gen: int  # Poll generation in which the order was last seen pending
+    
+    @classmethod
+    def from_order(cls, order, seen_gen: int = 0) -> '_OrdRec':
+        return cls(*_ORD_ATTRS(order), seen_gen)
+
 
 class MT5Monitor:
     def __init__(self, login: int, password: str, server: str, path: str = None):
@@ -14,10 +141,33 @@ class MT5Monitor:
         self.server = server
         self.path = path
         self.connected = False
+        self._refs = 0  # Number of holders of the shared connection
         self.last_trade_ticket = None
         self.last_order_ticket = None
         self.tracked_positions = {}
         self.tracked_orders = {}
+        self._gen = 0  # Incremented on every position/order poll; see get_new_positions
+        # Per-tick snapshots of positions/orders shared by every reader: (monotonic ts, tuple),
+        # or None when a write has invalidated them
+        self._pos_cache = None
+        self._ord_cache = None
+        self._snapshot_ttl = SNAPSHOT_MAX_AGE
+        # Symbol -> number of tracked positions/orders on it, kept in step with tracked_positions/
+        # tracked_orders so get_active_instruments needs no terminal call
+        self._active_symbols: Dict[str, int] = {}
+        self._account_cache = (0.0, None)  # (monotonic ts, balance)
+        # Per-tick account_info() snapshot shared by the risk checks: (monotonic ts, info), or None
+        self._acct_info_cache = None
+        self._equity_peak = 0.0  # Highest equity seen by check_drawdown (peak-to-trough reference)
+        self._pool = None  # Thread pool for overlapping blocking MT5 calls, shut down with the connection
+        self._digits_cache: Dict[str, int] = {}  # Symbol -> price digits; see _digits
+        self._contract_sizes: Dict[str, float] = {}  # Symbol -> trade contract size; see _contract_size
+        self._pl_cache: Dict[str, Dict] = {}  # Period -> deals fetched so far; see _period_deals
+        self._pl_lock = threading.Lock()  # _period_deals runs on pool threads
+        self._profit_column_cache = None  # (positions snapshot, its profit column); see _profit_column
+        # Symbol -> (level list, its length, compiled LevelsArray) for callers passing plain lists
+        self._levels_cache: Dict[str, tuple] = {}
+        self._groups_cache: Dict[str, tuple] = {}  # Same scheme for check_level_groups
         
     def connect(self) -> bool:
         """Initialize and connect to MT5 terminal"""
@@ -26,7 +176,7 @@ class MT5Monitor:
             init_kwargs['path'] = self.path
 
         if not mt5.initialize(**init_kwargs):
-            logger.error(f"MT5 initialization failed: {mt5.last_error()}")
+            logger.error("MT5 initialization failed: %s", mt5.last_error())
             return False
 
         # Verify we are logged into the correct account
@@ -34,21 +184,69 @@ class MT5Monitor:
         if info is None or info.login != self.login:
             authorized = mt5.login(self.login, password=self.password, server=self.server)
             if not authorized:
-                logger.error(f"MT5 login failed: {mt5.last_error()}")
+                logger.error("MT5 login failed: %s", mt5.last_error())
                 mt5.shutdown()
                 return False
         
         self.connected = True
-        account_info = mt5.account_info()
-        if account_info:
-            logger.info(f"Connected to MT5. Account: {account_info.login}, Balance: {account_info.balance}")
+        # account_info() is an extra terminal round trip only needed for this log line
+        if logger.isEnabledFor(logging.INFO):
+            account_info = mt5.account_info()
+            if account_info:
+                logger.info("Connected to MT5. Account: %s, Balance: %s", account_info.login, account_info.balance)
         
         # Initialize tracking
         self._update_tracked_items()
         return True
     
+    @classmethod
+    def get_shared(cls, login: int, password: str, server: str, path: str = None) -> Optional['MT5Monitor']:
+        """
+        Get the process-wide MT5 connection, connecting on first use
+        
+        Every successful call must be paired with a disconnect(); the terminal
+        is only shut down when the last holder disconnects.
+        
+        Returns:
+            Connected monitor, or None if the connection failed
+        """
+        global _shared_monitor
+        if _shared_monitor is None:
+            monitor = cls(login=login, password=password, server=server, path=path)
+            if not monitor.connect():
+                return None
+            _shared_monitor = monitor
+        elif not _shared_monitor.connected and not _shared_monitor.connect():
+            return None
+        _shared_monitor._refs += 1
+        return _shared_monitor
+    
+    @classmethod
+    def set_shared(cls, monitor: 'MT5Monitor'):
+        """Register an already-connected monitor as the shared connection"""
+        global _shared_monitor
+        _shared_monitor = monitor
+        monitor._refs += 1
+    
     def disconnect(self):
-        """Disconnect from MT5"""
+        """Disconnect from MT5 (shared connections stay open until the last holder disconnects)"""
+        global _shared_monitor
+        if self._refs > 1:
+            self._refs -= 1
+            return
+        self._refs = 0
+        if _shared_monitor is self:
+            _shared_monitor = None
+        self._shutdown()
+    
+    def _shutdown(self):
+        """Shut down the MT5 terminal connection"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+        self._pl_cache.clear()
+        self.invalidate_snapshot()
+        self._equity_peak = 0.0
         mt5.shutdown()
         self.connected = False
         logger.info("Disconnected from MT5")
@@ -73,7 +271,7 @@ class MT5Monitor:
                 return False
             return True
         except Exception as e:
-            logger.error(f"Error checking MT5 connection: {e}")
+            logger.error("Error checking MT5 connection: %s", e)
             self.connected = False
             return False
     
@@ -89,7 +287,7 @@ class MT5Monitor:
         # Even if self.connected is False, we need to ensure mt5.shutdown() is called
         # in case the connection was lost but cleanup wasn't performed
         if self.connected:
-            self.disconnect()
+            self._shutdown()
         else:
             # Connection was lost but disconnect() wasn't called, ensure cleanup
             try:
@@ -97,102 +295,263 @@ class MT5Monitor:
             except:
                 pass  # Ignore errors if already shut down
         
+        # The terminal may come back on a different server with different symbol specs
+        self.reset_symbol_cache()
+        # ...or on a different account, so the old equity high-water mark no longer applies
+        self._equity_peak = 0.0
         return self.connect()
     
+    def refresh_snapshot(self):
+        """Fetch positions and orders once so every reader in this tick can share them"""
+        now = time.monotonic()
+        self._pos_cache = (now, mt5.positions_get() or ())
+        self._ord_cache = (now, mt5.orders_get() or ())
+    
+    def invalidate_snapshot(self):
+        """Drop the cached positions/orders so the next read goes to the terminal"""
+        self.mark_dirty('both')
+    
+    def mark_dirty(self, scope: str = 'both'):
+        """
+        Invalidate cached terminal state after a write
+        
+        Every mt5.order_send() path must call this so the next read sees the change
+        instead of waiting for the snapshot TTL.
+        
+        Args:
+            scope: 'positions' (also drops the cached account state, which closes change),
+                'orders', or 'both'
+        """
+        if scope in ('positions', 'both'):
+            self._pos_cache = None
+            self._account_cache = (0.0, None)
+            self._acct_info_cache = None
+        if scope in ('orders', 'both'):
+            self._ord_cache = None
+    
+    def _positions(self):
+        """Get open positions from the snapshot, fetching them if it is stale or invalidated"""
+        cache = self._pos_cache
+        now = time.monotonic()
+        if cache is None or now - cache[0] >= self._snapshot_ttl:
+            cache = self._pos_cache = (now, mt5.positions_get() or ())
+        return cache[1]
+    
+    def _orders(self):
+        """Get pending orders from the snapshot, fetching them if it is stale or invalidated"""
+        cache = self._ord_cache
+        now = time.monotonic()
+        if cache is None or now - cache[0] >= self._snapshot_ttl:
+            cache = self._ord_cache = (now, mt5.orders_get() or ())
+        return cache[1]
+    
+    def _account(self):
+        """Get account_info() from the per-tick snapshot, fetching it if stale or invalidated"""
+        cache = self._acct_info_cache
+        now = time.monotonic()
+        if cache is None or now - cache[0] >= self._snapshot_ttl:
+            cache = self._acct_info_cache = (now, mt5.account_info())
+        return cache[1]
+    
+    def _digits(self, symbol: str) -> Optional[int]:
+        """Get a symbol's price digits, cached since they never change for a symbol"""
+        digits = self._digits_cache.get(symbol)
+        if digits is None:
+            symbol_info = mt5.symbol_info(symbol)
+            if symbol_info is None:
+                return None
+            digits = self._digits_cache[symbol] = symbol_info.digits
+        return digits
+    
+    def _contract_size(self, symbol: str) -> Optional[float]:
+        """Get a symbol's trade contract size, cached since it is fixed for the session"""
+        contract_size = self._contract_sizes.get(symbol)
+        if contract_size is None:
+            symbol_info = mt5.symbol_info(symbol)
+            if symbol_info is None:
+                return None
+            contract_size = self._contract_sizes[symbol] = getattr(symbol_info, 'trade_contract_size', 1)
+        return contract_size
+    
+    def reset_symbol_cache(self):
+        """Forget cached symbol specifications (digits, contract sizes)"""
+        self._digits_cache.clear()
+        self._contract_sizes.clear()
+    
+    def get_balance(self) -> float:
+        """Get the account balance, reusing the last value for up to BALANCE_MAX_AGE seconds"""
+        if not self.connected:
+            return 0.0
+        
+        now = time.monotonic()
+        cached_ts, balance = self._account_cache
+        if balance is not None and now - cached_ts < BALANCE_MAX_AGE:
+            return balance
+        
+        account_info = self._account()
+        if not account_info:
+            return 0.0
+        self._account_cache = (now, account_info.balance)
+        return account_info.balance
+    
+    def _profit_column(self, positions) -> np.ndarray:
+        """Profit of every position in a snapshot, extracted once per snapshot tuple"""
+        cached = self._profit_column_cache
+        if cached is None or cached[0] is not positions:
+            profits = np.fromiter(map(_PROFIT, positions), dtype=np.float64, count=len(positions))
+            profits.flags.writeable = False  # Shared by every reader of this snapshot
+            cached = self._profit_column_cache = (positions, profits)
+        return cached[1]
+    
+    def _open_profit(self, positions) -> float:
+        """Total floating profit of a positions snapshot"""
+        return float(self._profit_column(positions).sum())
+    
+    def positions(self):
+        """Get open positions (raw MT5 records) from the shared per-tick snapshot"""
+        return self._positions() if self.connected else ()
+    
+    def orders(self):
+        """Get pending orders (raw MT5 records) from the shared per-tick snapshot"""
+        return self._orders() if self.connected else ()
+    
+    def positions_for(self, symbol: str):
+        """Get open positions for one symbol, letting the terminal do the filtering"""
+        return mt5.positions_get(symbol=symbol) or ()
+    
+    def orders_for(self, symbol: str):
+        """Get pending orders for one symbol, letting the terminal do the filtering"""
+        return mt5.orders_get(symbol=symbol) or ()
+    
     def _update_tracked_items(self):
         """Update tracked positions and orders"""
         # Track open positions
-        positions = mt5.positions_get()
-        if positions:
-            for pos in positions:
-                self.tracked_positions[pos.ticket] = {
-                    'ticket': pos.ticket,
-                    'symbol': pos.symbol,
-                    'type': pos.type,
-                    'volume': pos.volume,
-                    'price_open': pos.price_open,
-                    'price_current': pos.price_current,
-                    'profit': pos.profit,
-                    'time': pos.time
-                }
-                if self.last_trade_ticket is None or pos.ticket > self.last_trade_ticket:
-                    self.last_trade_ticket = pos.ticket
+        positions = mt5.positions_get() or ()
+        for pos in positions:
+            self.tracked_positions[pos.ticket] = _PosRec.from_position(pos, self._gen)
+            if self.last_trade_ticket is None or pos.ticket > self.last_trade_ticket:
+                self.last_trade_ticket = pos.ticket
         
         # Track pending orders
-        orders = mt5.orders_get()
-        if orders:
-            for order in orders:
-                self.tracked_orders[order.ticket] = {
-                    'ticket': order.ticket,
-                    'symbol': order.symbol,
-                    'type': order.type,
-                    'volume': order.volume_initial,
-                    'price_open': order.price_open,
-                    'price_current': order.price_current,
-                    'time_setup': order.time_setup,
-                    'time_expiration': order.time_expiration
-                }
-                if self.last_order_ticket is None or order.ticket > self.last_order_ticket:
-                    self.last_order_ticket = order.ticket
+        orders = mt5.orders_get() or ()
+        for order in orders:
+            self.tracked_orders[order.ticket] = _OrdRec.from_order(order, self._gen)
+            if self.last_order_ticket is None or order.ticket > self.last_order_ticket:
+                self.last_order_ticket = order.ticket
+        
+        self._trim_tracked(self.tracked_positions)
+        self._trim_tracked(self.tracked_orders)
+        
+        # Full rescan of the tracked symbols; polls keep it up to date from here on
+        self._active_symbols = {}
+        for tracked in self.tracked_positions.values():
+            self._track_symbol(tracked.symbol)
+        for tracked in self.tracked_orders.values():
+            self._track_symbol(tracked.symbol)
     
-    def get_new_positions(self) -> List[Dict]:
-        """Get newly opened positions since last check"""
+    def _trim_tracked(self, tracked: Dict):
+        """Drop the oldest records (dicts keep insertion order) beyond MAX_TRACKED"""
+        excess = len(tracked) - MAX_TRACKED
+        if excess > 0:
+            for ticket in list(itertools.islice(tracked, excess)):
+                self._untrack_symbol(tracked.pop(ticket).symbol)
+    
+    def _track_symbol(self, symbol: str):
+        """Count one more tracked position/order on symbol"""
+        self._active_symbols[symbol] = self._active_symbols.get(symbol, 0) + 1
+    
+    def _untrack_symbol(self, symbol: str):
+        """Count one fewer tracked position/order on symbol, dropping it at zero"""
+        count = self._active_symbols.get(symbol, 0) - 1
+        if count > 0:
+            self._active_symbols[symbol] = count
+        else:
+            self._active_symbols.pop(symbol, None)
+    
+    def get_new_positions(self, symbols: Optional[List[str]] = None,
+                          event_filter: Optional[Callable[[int, str], bool]] = None) -> List[Dict]:
+        """
+        Get newly opened positions since last check
+        
+        Args:
+            symbols: Optional symbols to restrict the check to (None = all positions)
+            event_filter: Optional (ticket, symbol) predicate; events it rejects are still
+                tracked but not built or returned
+        
+        Returns:
+            List of new and closed position dictionaries
+        """
         if not self.connected:
             return []
         
         new_positions = []
-        positions = mt5.positions_get()
+        if symbols is None:
+            positions = self._positions()
+        else:
+            symbols = set(symbols)
+            positions = [pos for symbol in symbols for pos in self.positions_for(symbol)]
         
-        if positions:
-            for pos in positions:
-                if pos.ticket not in self.tracked_positions:
-                    new_positions.append({
-                        'ticket': pos.ticket,
-                        'symbol': pos.symbol,
-                        'type': 'BUY' if pos.type == mt5.ORDER_TYPE_BUY else 'SELL',
-                        'volume': pos.volume,
-                        'price_open': pos.price_open,
-                        'price_current': pos.price_current,
-                        'profit': pos.profit,
-                        'time': datetime.fromtimestamp(pos.time).strftime('%Y-%m-%d %H:%M:%S')
-                    })
-                    self.tracked_positions[pos.ticket] = {
-                        'ticket': pos.ticket,
-                        'symbol': pos.symbol,
-                        'type': pos.type,
-                        'volume': pos.volume,
-                        'price_open': pos.price_open,
-                        'price_current': pos.price_current,
-                        'profit': pos.profit,
-                        'time': pos.time
-                    }
-                else:
-                    # Update existing position
-                    tracked = self.tracked_positions[pos.ticket]
-                    tracked['price_current'] = pos.price_current
-                    tracked['profit'] = pos.profit
+        # Mark every position seen in this poll with the current generation; anything
+        # tracked that still carries an older generation has closed
+        self._gen += 1
+        gen = self._gen
+        tracked_positions = self.tracked_positions
+        
+        append = new_positions.append
+        for pos in positions:
+            tracked = tracked_positions.get(pos.ticket)
+            if tracked is None:
+                fields = _POS_ATTRS(pos)
+                ticket, symbol, pos_type, volume, price_open, price_current, profit, opened = fields
+                tracked_positions[ticket] = _PosRec(*fields, gen)
+                self._track_symbol(symbol)
+                if event_filter is not None and not event_filter(ticket, symbol):
+                    continue
+                append({
+                    'ticket': ticket,
+                    'symbol': symbol,
+                    'type': _ORDER_TYPE_NAMES[pos_type],
+                    'volume': volume,
+                    'price_open': price_open,
+                    'price_current': price_current,
+                    'profit': profit,
+                    'time': _fmt_ts(opened)
+                })
+            else:
+                # Update existing position
+                tracked.price_current = pos.price_current
+                tracked.profit = pos.profit
+                tracked.seen_gen = gen
         
-        # Check for closed positions
-        tracked_tickets = set(self.tracked_positions.keys())
-        current_tickets = {pos.ticket for pos in positions} if positions else set()
-        closed_tickets = tracked_tickets - current_tickets
+        # Check for closed positions (only among the symbols that were fetched)
+        closed_tickets = [ticket for ticket, tracked in tracked_positions.items()
+                          if tracked.seen_gen != gen and (symbols is None or tracked.symbol in symbols)]
+        
+        if closed_tickets:
+            # One timestamp for every position closed in this poll
+            now = datetime.now()
+            now_str = now.strftime('%Y-%m-%d %H:%M:%S')
+            now_iso = now.isoformat()
         
         for ticket in closed_tickets:
-            closed_pos = self.tracked_positions.pop(ticket)
+            closed_pos = tracked_positions.pop(ticket)
+            self._untrack_symbol(closed_pos.symbol)
+            if event_filter is not None and not event_filter(ticket, closed_pos.symbol):
+                continue
             
             # Get detailed trade information from deal history
             trade_details = self._get_trade_details_from_deals(ticket)
             
             position_data = {
-                'ticket': closed_pos['ticket'],
-                'symbol': closed_pos['symbol'],
+                'ticket': closed_pos.ticket,
+                'symbol': closed_pos.symbol,
                 'type': 'CLOSED',
-                'volume': closed_pos['volume'],
-                'price_open': closed_pos['price_open'],
-                'profit': closed_pos['profit'],
-                'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'time_open': closed_pos.get('time'),
-                'time_close': datetime.now().isoformat(),
+                'volume': closed_pos.volume,
+                'price_open': closed_pos.price_open,
+                'profit': closed_pos.profit,
+                'time': now_str,
+                'time_open': closed_pos.time,
+                'time_close': now_iso,
                 'price_close': trade_details.get('price_close'),
                 'commission': trade_details.get('commission', 0),
                 'swap': trade_details.get('swap', 0),
@@ -203,6 +562,7 @@ class MT5Monitor:
             
             new_positions.append(position_data)
         
+        self._trim_tracked(tracked_positions)
         return new_positions
     
     def _get_trade_details_from_deals(self, position_ticket: int) -> Dict:
@@ -212,7 +572,6 @@ class MT5Monitor:
         
         try:
             # Get deals for this position (last 24 hours should be enough)
-            from datetime import timedelta
             end_time = datetime.now()
             start_time = end_time - timedelta(days=1)
             start_timestamp = int(start_time.timestamp())
@@ -232,11 +591,11 @@ class MT5Monitor:
             
             for deal in deals:
                 if deal.position_id == position_ticket:
-                    if deal.entry == mt5.DEAL_ENTRY_IN:
+                    if deal.entry == _DEAL_IN:
                         entry_deal = deal
                         sl = deal.sl if deal.sl > 0 else None
                         tp = deal.tp if deal.tp > 0 else None
-                    elif deal.entry == mt5.DEAL_ENTRY_OUT:
+                    elif deal.entry == _DEAL_OUT:
                         exit_deal = deal
                     
                     total_commission += deal.commission
@@ -262,72 +621,73 @@ class MT5Monitor:
             
             return result
         except Exception as e:
-            logger.error(f"Error getting trade details from deals: {e}")
+            logger.error("Error getting trade details from deals: %s", e)
             return {}
     
-    def get_new_orders(self) -> List[Dict]:
-        """Get newly placed or modified orders since last check"""
+    def get_new_orders(self, event_filter: Optional[Callable[[int, str], bool]] = None) -> List[Dict]:
+        """
+        Get newly placed or modified orders since last check
+        
+        Args:
+            event_filter: Optional (ticket, symbol) predicate; events it rejects are still
+                tracked but not built or returned
+        """
         if not self.connected:
             return []
         
         new_orders = []
-        orders = mt5.orders_get()
-        
-        if orders:
-            for order in orders:
-                if order.ticket not in self.tracked_orders:
-                    order_type_map = {
-                        mt5.ORDER_TYPE_BUY_LIMIT: 'BUY LIMIT',
-                        mt5.ORDER_TYPE_SELL_LIMIT: 'SELL LIMIT',
-                        mt5.ORDER_TYPE_BUY_STOP: 'BUY STOP',
-                        mt5.ORDER_TYPE_SELL_STOP: 'SELL STOP',
-                        mt5.ORDER_TYPE_BUY_STOP_LIMIT: 'BUY STOP LIMIT',
-                        mt5.ORDER_TYPE_SELL_STOP_LIMIT: 'SELL STOP LIMIT'
-                    }
-                    
-                    new_orders.append({
-                        'ticket': order.ticket,
-                        'symbol': order.symbol,
-                        'type': order_type_map.get(order.type, 'UNKNOWN'),
-                        'volume': order.volume_initial,
-                        'price_open': order.price_open,
-                        'price_current': order.price_current,
-                        'time_setup': datetime.fromtimestamp(order.time_setup).strftime('%Y-%m-%d %H:%M:%S'),
-                        'time_expiration': datetime.fromtimestamp(order.time_expiration).strftime('%Y-%m-%d %H:%M:%S') if order.time_expiration > 0 else 'No expiration'
-                    })
-                    self.tracked_orders[order.ticket] = {
-                        'ticket': order.ticket,
-                        'symbol': order.symbol,
-                        'type': order.type,
-                        'volume': order.volume_initial,
-                        'price_open': order.price_open,
-                        'price_current': order.price_current,
-                        'time_setup': order.time_setup,
-                        'time_expiration': order.time_expiration
-                    }
+        orders = self._orders()
+        
+        # Same generation scheme as get_new_positions: orders not re-tagged in this poll are gone
+        self._gen += 1
+        gen = self._gen
+        tracked_orders = self.tracked_orders
+        
+        append = new_orders.append
+        for order in orders:
+            tracked = tracked_orders.get(order.ticket)
+            if tracked is None:
+                fields = _ORD_ATTRS(order)
+                ticket, symbol, order_type, volume, price_open, price_current, time_setup, time_expiration = fields
+                tracked_orders[ticket] = _OrdRec(*fields, gen)
+                self._track_symbol(symbol)
+                if event_filter is not None and not event_filter(ticket, symbol):
+                    continue
+                append({
+                    'ticket': ticket,
+                    'symbol': symbol,
+                    'type': _order_type_name(order_type),
+                    'volume': volume,
+                    'price_open': price_open,
+                    'price_current': price_current,
+                    'time_setup': _fmt_ts(time_setup),
+                    'time_expiration': _fmt_ts(time_expiration) if time_expiration > 0 else 'No expiration'
+                })
+            else:
+                tracked.seen_gen = gen
         
         # Check for executed/cancelled orders
-        tracked_order_tickets = set(self.tracked_orders.keys())
-        current_order_tickets = {order.ticket for order in orders} if orders else set()
-        removed_orders = tracked_order_tickets - current_order_tickets
+        removed_orders = [ticket for ticket, tracked in tracked_orders.items()
+                          if tracked.seen_gen != gen]
+        
+        if removed_orders:
+            now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
         for ticket in removed_orders:
-            removed_order = self.tracked_orders.pop(ticket)
-            order_type_map = {
-                mt5.ORDER_TYPE_BUY_LIMIT: 'BUY LIMIT',
-                mt5.ORDER_TYPE_SELL_LIMIT: 'SELL LIMIT',
-                mt5.ORDER_TYPE_BUY_STOP: 'BUY STOP',
-                mt5.ORDER_TYPE_SELL_STOP: 'SELL STOP',
-            }
+            removed_order = tracked_orders.pop(ticket)
+            self._untrack_symbol(removed_order.symbol)
+            if event_filter is not None and not event_filter(ticket, removed_order.symbol):
+                continue
             new_orders.append({
-                'ticket': removed_order['ticket'],
-                'symbol': removed_order['symbol'],
-                'type': f"{order_type_map.get(removed_order['type'], 'ORDER')} EXECUTED/CANCELLED",
-                'volume': removed_order['volume'],
-                'price_open': removed_order['price_open'],
-                'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'ticket': removed_order.ticket,
+                'symbol': removed_order.symbol,
+                'type': f"{_order_type_name(removed_order.type, 'ORDER')} EXECUTED/CANCELLED",
+                'volume': removed_order.volume,
+                'price_open': removed_order.price_open,
+                'time': now_str
             })
         
+        self._trim_tracked(tracked_orders)
         return new_orders
     
     def get_symbol_price(self, symbol: str) -> Optional[Dict]:
@@ -341,70 +701,160 @@ class MT5Monitor:
                 'symbol': symbol,
                 'bid': tick.bid,
                 'ask': tick.ask,
-                'time': datetime.fromtimestamp(tick.time).strftime('%Y-%m-%d %H:%M:%S')
+                'time': _fmt_ts(tick.time)
             }
         return None
     
-    def check_price_levels(self, symbol: str, levels: List[Dict]) -> List[Dict]:
-        """Check if price has reached any of the specified levels"""
+    async def aget_symbol_price(self, symbol: str) -> Optional[Dict]:
+        """Async get_symbol_price: runs the tick fetch on the shared MT5 thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor(), self.get_symbol_price, symbol)
+    
+    async def apoll(self, symbols: List[str]) -> Dict:
+        """
+        Fetch one monitoring tick's terminal state with the blocking calls overlapped
+        
+        The symbol ticks and the positions/orders snapshot are fetched concurrently on
+        the thread pool; the position/order diffs then run on the calling thread against
+        the warm snapshot, since they update shared tracking state.
+        
+        The overlap depends on the MetaTrader5 binding releasing the GIL while it waits on
+        terminal IPC. If a build holds it, the calls serialise on the pool but still run
+        off the event loop thread.
+        
+        Args:
+            symbols: Symbols to fetch prices for
+        
+        Returns:
+            Dict with 'prices' (symbol -> get_symbol_price result), 'positions'
+            (get_new_positions result) and 'orders' (get_new_orders result)
+        """
+        if not self.connected:
+            return {'prices': {}, 'positions': [], 'orders': []}
+        loop = asyncio.get_running_loop()
+        pool = self._executor()
+        symbols = list(symbols)
+        results = await asyncio.gather(
+            loop.run_in_executor(pool, self._positions),
+            loop.run_in_executor(pool, self._orders),
+            *(self.aget_symbol_price(symbol) for symbol in symbols)
+        )
+        return {
+            'prices': dict(zip(symbols, results[2:])),
+            'positions': self.get_new_positions(),
+            'orders': self.get_new_orders(),
+        }
+    
+    def check_price_levels(self, symbol: str, levels: Union[List[Dict], LevelsArray],
+                           price_info: Optional[Dict] = None) -> List[Dict]:
+        """
+        Check if price has reached any of the specified levels
+        
+        Args:
+            symbol: Symbol to check
+            levels: Level dicts, or a LevelsArray precompiled with Config.compile_levels
+            price_info: Optional price already fetched this tick (see apoll); fetched if None
+        
+        Returns:
+            List of triggered level alerts, in the levels' configured order
+        """
         if not self.connected:
             return []
         
-        price_info = self.get_symbol_price(symbol)
+        if not isinstance(levels, LevelsArray):
+            levels = self._compiled_levels(symbol, levels)
+        if len(levels.prices) == 0:
+            return []
+        
+        if price_info is None:
+            price_info = self.get_symbol_price(symbol)
         if not price_info:
             return []
         
-        triggered = []
         current_price = (price_info['bid'] + price_info['ask']) / 2
-        current_time = datetime.now()
+        prices = levels.prices
+        
+        # Each type is a price-sorted block, so its triggered levels form one contiguous
+        # slice found by binary search - O(log L) plus the number of hits
+        above_start, above_end = levels.block(LEVEL_ABOVE)
+        below_start, below_end = levels.block(LEVEL_BELOW)
+        both_start, both_end = levels.block(LEVEL_BOTH)
+        
+        above = prices[above_start:above_end]
+        below = prices[below_start:below_end]
+        both = prices[both_start:both_end]
+        above_hi = above_start + np.searchsorted(above, current_price, side='right')  # price <= current
+        below_lo = below_start + np.searchsorted(below, current_price, side='left')   # price >= current
+        # 'both' levels trigger when they equal the price at the symbol's quoted precision
+        # (1e-4 if unknown): search a one-tick window, then compare the rounded tick counts
+        digits = self._digits(symbol)
+        scale = 10.0 ** (4 if digits is None else digits)
+        tick = 1.0 / scale
+        near_lo = both_start + np.searchsorted(both, current_price - tick, side='left')
+        near_hi = both_start + np.searchsorted(both, current_price + tick, side='right')
+        near = np.arange(near_lo, near_hi)
+        near = near[np.rint(prices[near] * scale) == np.rint(current_price * scale)]
+        
+        hits = np.concatenate((
+            np.arange(above_start, above_hi),
+            np.arange(below_lo, below_end),
+            near,
+        ))
+        hits = hits[levels.expiration[hits] > time.time()]
+        hits = hits[np.argsort(levels.order[hits])]
         
-        for level in levels:
-            level_price = level.get('price')
-            level_type = level.get('type', 'both')  # 'above', 'below', 'both'
-            level_id = level.get('id', 'unknown')
-            
-            if level_price is None:
-                continue
-            
-            # Check expiration date
-            expiration = level.get('expiration')
-            if expiration:
-                try:
-                    if isinstance(expiration, str):
-                        exp_time = datetime.fromisoformat(expiration)
-                    else:
-                        exp_time = datetime.fromtimestamp(expiration)
-                    if current_time > exp_time:
-                        continue  # Level has expired, skip it
-                except (ValueError, TypeError):
-                    logger.warning(f"Invalid expiration format for level {level_id}")
-            
-            triggered_flag = False
-            if level_type == 'above' and current_price >= level_price:
-                triggered_flag = True
-            elif level_type == 'below' and current_price <= level_price:
-                triggered_flag = True
-            elif level_type == 'both' and abs(current_price - level_price) < 0.0001:
-                triggered_flag = True
-            
-            if triggered_flag:
-                triggered.append({
-                    'symbol': symbol,
-                    'level_id': level_id,
-                    'level_price': level_price,
-                    'current_price': current_price,
-                    'level_type': level_type,
-                    'time': price_info['time'],
-                    'recurring': level.get('recurring', False),  # Default to one-time
-                    'group': level.get('group'),  # Group identifier
-                    'description': level.get('description', '')
-                })
+        triggered = []
+        for i in hits:
+            level = levels.levels[i]
+            triggered.append({
+                'symbol': symbol,
+                'level_id': level.get('id', 'unknown'),
+                'level_price': level.get('price'),
+                'current_price': current_price,
+                'level_type': level.get('type', 'both'),
+                'time': price_info['time'],
+                'recurring': bool(levels.recurring[i]),  # Default to one-time
+                'group': level.get('group'),  # Group identifier
+                'description': level.get('description', '')
+            })
         
         return triggered
     
+    def _compiled_levels(self, symbol: str, levels: List[Dict]) -> LevelsArray:
+        """
+        Compile a plain level list, reusing the result while the same list is passed again
+        
+        The cache is keyed on the list's identity and length, so lists edited in place
+        (rather than replaced) should be passed as a fresh list or precompiled LevelsArray.
+        """
+        cached = self._levels_cache.get(symbol)
+        if cached is not None and cached[0] is levels and cached[1] == len(levels):
+            return cached[2]
+        compiled = LevelsArray.from_levels(levels)
+        self._levels_cache[symbol] = (levels, len(levels), compiled)
+        return compiled
+    
+    def get_rates(self, symbol: str, timeframe: int = mt5.TIMEFRAME_H1, periods: int = 100):
+        """
+        Fetch the most recent bars for a symbol
+        
+        Blocking MT5 call, safe to run from a worker thread.
+        
+        Returns:
+            NumPy record array of rates, or None if unavailable
+        """
+        if not self.connected:
+            return None
+        return mt5.copy_rates_from_pos(symbol, timeframe, 0, periods)
+    
+    async def aget_rates(self, symbol: str, timeframe: int = mt5.TIMEFRAME_H1, periods: int = 100):
+        """Async get_rates: runs the bar fetch on the shared MT5 thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor(), self.get_rates, symbol, timeframe, periods)
+    
     def detect_support_resistance(self, symbol: str, timeframe: int = mt5.TIMEFRAME_H1, 
                                   periods: int = 100, min_touches: int = 2, 
-                                  tolerance_pct: float = 0.5) -> Dict[str, List[float]]:
+                                  tolerance_pct: float = 0.5, rates=None) -> Dict[str, List[float]]:
         """
         Automatically detect support and resistance levels from historical price data
         
@@ -414,6 +864,7 @@ class MT5Monitor:
             periods: Number of periods to analyze (default: 100)
             min_touches: Minimum number of price touches to consider a level valid (default: 2)
             tolerance_pct: Percentage tolerance for level detection (default: 0.5%)
+            rates: Optional pre-fetched rates (see get_rates); fetched from MT5 if None
         
         Returns:
             Dictionary with 'support' and 'resistance' lists of price levels
@@ -422,95 +873,96 @@ class MT5Monitor:
             return {'support': [], 'resistance': []}
         
         # Get historical data
-        rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, periods)
+        if rates is None:
+            rates = self.get_rates(symbol, timeframe, periods)
         if rates is None or len(rates) == 0:
-            logger.warning(f"Could not retrieve historical data for {symbol}")
+            logger.warning("Could not retrieve historical data for %s", symbol)
             return {'support': [], 'resistance': []}
         
-        # Extract high, low, close prices
+        # Extract high and low prices
         highs = rates['high']
         lows = rates['low']
-        closes = rates['close']
-        
-        # Find local maxima (resistance) and minima (support)
-        resistance_levels = []
-        support_levels = []
-        
-        # Use a simple approach: find pivot highs and lows
-        for i in range(2, len(rates) - 2):
-            # Check for resistance (local high)
-            if (highs[i] > highs[i-1] and highs[i] > highs[i-2] and 
-                highs[i] > highs[i+1] and highs[i] > highs[i+2]):
-                resistance_levels.append(float(highs[i]))
-            
-            # Check for support (local low)
-            if (lows[i] < lows[i-1] and lows[i] < lows[i-2] and 
-                lows[i] < lows[i+1] and lows[i] < lows[i+2]):
-                support_levels.append(float(lows[i]))
+        
+        # Find local maxima (resistance) and minima (support): a pivot beats the two bars on
+        # either side, compared over shifted views of the whole series at once
+        center = highs[2:-2]
+        resistance_mask = ((center > highs[1:-3]) & (center > highs[:-4]) &
+                           (center > highs[3:-1]) & (center > highs[4:]))
+        resistance_levels = center[resistance_mask]
+        
+        center = lows[2:-2]
+        support_mask = ((center < lows[1:-3]) & (center < lows[:-4]) &
+                        (center < lows[3:-1]) & (center < lows[4:]))
+        support_levels = center[support_mask]
         
         # Group similar levels within tolerance
-        def group_levels(levels: List[float], tolerance_pct: float) -> List[float]:
-            if not levels:
+        def group_levels(levels: np.ndarray, tolerance_pct: float) -> List[float]:
+            if len(levels) == 0:
                 return []
             
-            levels = sorted(levels)
+            levels = np.sort(levels).tolist()
             grouped = []
-            current_group = [levels[0]]
+            tolerance_ratio = tolerance_pct / 100
+            # Running sum/count of the current group, so its mean is O(1) per level
+            group_sum = levels[0]
+            group_count = 1
             
             for level in levels[1:]:
                 # Check if level is within tolerance of current group
-                avg_group = sum(current_group) / len(current_group)
-                tolerance = avg_group * (tolerance_pct / 100)
+                avg_group = group_sum / group_count
+                tolerance = avg_group * tolerance_ratio
                 
                 if abs(level - avg_group) <= tolerance:
-                    current_group.append(level)
+                    group_sum += level
+                    group_count += 1
                 else:
                     # Finalize current group if it has enough touches
-                    if len(current_group) >= min_touches:
-                        grouped.append(sum(current_group) / len(current_group))
-                    current_group = [level]
+                    if group_count >= min_touches:
+                        grouped.append(avg_group)
+                    group_sum = level
+                    group_count = 1
             
             # Add final group
-            if len(current_group) >= min_touches:
-                grouped.append(sum(current_group) / len(current_group))
+            if group_count >= min_touches:
+                grouped.append(group_sum / group_count)
             
+            # Groups are consecutive runs of the sorted levels, so their means come out ascending
             return grouped
         
         resistance = group_levels(resistance_levels, tolerance_pct)
         support = group_levels(support_levels, tolerance_pct)
         
         return {
-            'support': sorted(support),
-            'resistance': sorted(resistance, reverse=True)
+            'support': support,
+            'resistance': resistance[::-1]
         }
     
     def check_level_groups(self, symbol: str, levels: List[Dict], 
-                          triggered_levels: List[str]) -> List[Dict]:
+                          triggered_levels: Collection[str]) -> List[Dict]:
         """
         Check if multiple levels in a group have been triggered
         
         Args:
             symbol: Symbol being checked
             levels: List of price levels
-            triggered_levels: List of level IDs that have been triggered
+            triggered_levels: IDs of the levels that have been triggered (ideally a set)
         
         Returns:
             List of group alerts if group conditions are met
         """
-        # Group levels by their group identifier
-        groups = {}
-        for level in levels:
-            group_id = level.get('group')
-            if group_id:
-                if group_id not in groups:
-                    groups[group_id] = {
-                        'levels': [],
-                        'required_count': level.get('group_required_count', 2),  # Default: 2 levels
-                        'description': level.get('group_description', f'Group {group_id}')
-                    }
-                groups[group_id]['levels'].append(level)
+        if not isinstance(triggered_levels, (set, frozenset)):
+            triggered_levels = set(triggered_levels)
+        
+        # Group levels by their group identifier, reusing the grouping while the list is unchanged
+        cached = self._groups_cache.get(symbol)
+        if cached is not None and cached[0] is levels and cached[1] == len(levels):
+            groups = cached[2]
+        else:
+            groups = _build_groups(levels)
+            self._groups_cache[symbol] = (levels, len(levels), groups)
         
         group_alerts = []
+        now_str = None
         for group_id, group_info in groups.items():
             triggered_in_group = [
                 level for level in group_info['levels'] 
@@ -518,6 +970,8 @@ class MT5Monitor:
             ]
             
             if len(triggered_in_group) >= group_info['required_count']:
+                if now_str is None:
+                    now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 group_alerts.append({
                     'symbol': symbol,
                     'group_id': group_id,
@@ -525,7 +979,7 @@ class MT5Monitor:
                     'triggered_count': len(triggered_in_group),
                     'required_count': group_info['required_count'],
                     'triggered_levels': [l.get('id') for l in triggered_in_group],
-                    'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    'time': now_str
                 })
         
         return group_alerts
@@ -535,21 +989,9 @@ class MT5Monitor:
         if not self.connected:
             return set()
         
-        instruments = set()
-        
-        # Get instruments from positions
-        positions = mt5.positions_get()
-        if positions:
-            for pos in positions:
-                instruments.add(pos.symbol)
-        
-        # Get instruments from orders (including pending limits)
-        orders = mt5.orders_get()
-        if orders:
-            for order in orders:
-                instruments.add(order.symbol)
-        
-        return instruments
+        # Maintained by get_new_positions/get_new_orders as tickets appear and disappear, so this
+        # reflects the last poll; callers may add to the result, so hand out a mutable copy
+        return set(self._active_symbols)
     
     def get_pending_orders_by_symbol(self) -> Dict[str, List[Dict]]:
         """Get all pending orders grouped by symbol"""
@@ -557,32 +999,18 @@ class MT5Monitor:
             return {}
         
         orders_by_symbol = {}
-        orders = mt5.orders_get()
+        orders = self._orders()
         
-        if orders:
-            for order in orders:
-                symbol = order.symbol
-                if symbol not in orders_by_symbol:
-                    orders_by_symbol[symbol] = []
-                
-                order_type_map = {
-                    mt5.ORDER_TYPE_BUY_LIMIT: 'BUY LIMIT',
-                    mt5.ORDER_TYPE_SELL_LIMIT: 'SELL LIMIT',
-                    mt5.ORDER_TYPE_BUY_STOP: 'BUY STOP',
-                    mt5.ORDER_TYPE_SELL_STOP: 'SELL STOP',
-                    mt5.ORDER_TYPE_BUY_STOP_LIMIT: 'BUY STOP LIMIT',
-                    mt5.ORDER_TYPE_SELL_STOP_LIMIT: 'SELL STOP LIMIT'
-                }
-                
-                orders_by_symbol[symbol].append({
-                    'ticket': order.ticket,
-                    'type': order_type_map.get(order.type, 'UNKNOWN'),
-                    'volume': order.volume_initial,
-                    'price_open': order.price_open,
-                    'price_current': order.price_current,
-                    'time_setup': datetime.fromtimestamp(order.time_setup).strftime('%Y-%m-%d %H:%M:%S'),
-                    'time_expiration': datetime.fromtimestamp(order.time_expiration).strftime('%Y-%m-%d %H:%M:%S') if order.time_expiration > 0 else None
-                })
+        for order in orders:
+            orders_by_symbol.setdefault(order.symbol, []).append({
+                'ticket': order.ticket,
+                'type': _order_type_name(order.type),
+                'volume': order.volume_initial,
+                'price_open': order.price_open,
+                'price_current': order.price_current,
+                'time_setup': _fmt_ts(order.time_setup),
+                'time_expiration': _fmt_ts(order.time_expiration) if order.time_expiration > 0 else None
+            })
         
         return orders_by_symbol
     
@@ -596,25 +1024,32 @@ class MT5Monitor:
             return []
         
         current_price = (price_info['bid'] + price_info['ask']) / 2
-        pending_orders = self.get_pending_orders_by_symbol().get(symbol, [])
+        # The tick's orders snapshot is already in memory, so filter it rather than
+        # formatting every order (get_pending_orders_by_symbol) or asking the terminal again
+        pending_orders = [order for order in self._orders() if order.symbol == symbol]
+        if not pending_orders:
+            return []
+        
+        order_prices = np.fromiter(map(_PRICE_OPEN, pending_orders), dtype=np.float64,
+                                   count=len(pending_orders))
+        if current_price > 0:
+            distance_pcts = np.abs(current_price - order_prices) / current_price * 100
+        else:
+            distance_pcts = np.zeros_like(order_prices)
         
         alerts = []
-        for order in pending_orders:
-            order_price = order['price_open']
-            price_diff = abs(current_price - order_price)
-            price_diff_pct = (price_diff / current_price * 100) if current_price > 0 else 0
-            
-            if price_diff_pct <= threshold_pct:
-                alerts.append({
-                    'symbol': symbol,
-                    'ticket': order['ticket'],
-                    'order_type': order['type'],
-                    'order_price': order_price,
-                    'current_price': current_price,
-                    'distance_pct': round(price_diff_pct, 2),
-                    'volume': order['volume'],
-                    'time': price_info['time']
-                })
+        for i in np.flatnonzero(distance_pcts <= threshold_pct).tolist():
+            order = pending_orders[i]
+            alerts.append({
+                'symbol': symbol,
+                'ticket': order.ticket,
+                'order_type': _order_type_name(order.type),
+                'order_price': order.price_open,
+                'current_price': current_price,
+                'distance_pct': round(float(distance_pcts[i]), 2),
+                'volume': order.volume_initial,
+                'time': price_info['time']
+            })
         
         return alerts
     
@@ -624,50 +1059,89 @@ class MT5Monitor:
             return []
         
         suggestions = []
-        positions = mt5.positions_get()
+        positions = self._positions()
         
         if not positions:
             return []
         
-        account_info = mt5.account_info()
-        account_balance = account_info.balance if account_info else 0
+        account_balance = self.get_balance()
         
-        for pos in positions:
-            if pos.profit >= min_profit:
-                # Calculate profit as percentage of account
-                profit_pct = (pos.profit / account_balance * 100) if account_balance > 0 else 0
-                
-                # Suggest if profit meets threshold
-                if profit_pct >= profit_percentage or pos.profit >= min_profit * 2:
-                    suggestions.append({
-                        'ticket': pos.ticket,
-                        'symbol': pos.symbol,
-                        'type': 'BUY' if pos.type == mt5.ORDER_TYPE_BUY else 'SELL',
-                        'volume': pos.volume,
-                        'volume_to_close': round(pos.volume / 2, 2),  # Suggest closing half
-                        'price_open': pos.price_open,
-                        'price_current': pos.price_current,
-                        'profit': pos.profit,
-                        'profit_percentage': round(profit_pct, 2),
-                        'time': datetime.fromtimestamp(pos.time).strftime('%Y-%m-%d %H:%M:%S')
-                    })
+        # Filter on a profit column so dicts are only built for the positions that qualify
+        profits = self._profit_column(positions)
+        if account_balance > 0:
+            # Calculate profit as percentage of account
+            profit_pcts = profits / account_balance * 100
+        else:
+            profit_pcts = np.zeros_like(profits)
+        
+        # Suggest if profit meets threshold
+        hits = np.flatnonzero((profits >= min_profit) &
+                              ((profit_pcts >= profit_percentage) | (profits >= min_profit * 2)))
+        
+        for i in hits.tolist():
+            ticket, symbol, pos_type, volume, price_open, price_current, profit, opened = _POS_ATTRS(positions[i])
+            suggestions.append({
+                'ticket': ticket,
+                'symbol': symbol,
+                'type': _ORDER_TYPE_NAMES[pos_type],
+                'volume': volume,
+                'volume_to_close': round(volume / 2, 2),  # Suggest closing half
+                'price_open': price_open,
+                'price_current': price_current,
+                'profit': profit,
+                'profit_percentage': round(float(profit_pcts[i]), 2),
+                'time': _fmt_ts(opened)
+            })
         
         return suggestions
     
+    def _executor(self) -> ThreadPoolExecutor:
+        """Thread pool for overlapping blocking MT5 calls, created on first use"""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='mt5io')
+        return self._pool
+    
+    def _submit_many(self, *calls) -> list:
+        """
+        Run independent blocking MT5 calls concurrently on the shared pool
+        
+        Args:
+            calls: (function, *args) tuples
+        
+        Returns:
+            The calls' results, in the order given
+        """
+        pool = self._executor()
+        futures = [pool.submit(*call) for call in calls]
+        return [future.result() for future in futures]
+    
     def get_account_info(self) -> Optional[Dict]:
         """Get account information"""
         if not self.connected:
             return None
-        
-        account_info = mt5.account_info()
+        account_info, positions = self._submit_many((self._account,), (self._positions,))
+        return self._build_account_info(account_info, positions)
+    
+    async def aget_account_info(self) -> Optional[Dict]:
+        """Async get_account_info: fetches account and positions concurrently"""
+        if not self.connected:
+            return None
+        loop = asyncio.get_running_loop()
+        pool = self._executor()
+        account_info, positions = await asyncio.gather(
+            loop.run_in_executor(pool, self._account),
+            loop.run_in_executor(pool, self._positions),
+        )
+        return self._build_account_info(account_info, positions)
+    
+    def _build_account_info(self, account_info, positions) -> Optional[Dict]:
         if not account_info:
             return None
         
-        positions = mt5.positions_get()
-        open_positions_count = len(positions) if positions else 0
+        open_positions_count = len(positions)
         
         # Calculate total profit from open positions
-        total_profit = sum(pos.profit for pos in positions) if positions else 0.0
+        total_profit = self._open_profit(positions)
         
         return {
             'login': account_info.login,
@@ -685,32 +1159,30 @@ class MT5Monitor:
     
     def get_all_positions(self) -> List[Dict]:
         """Get all open positions with detailed information"""
+        return list(self.iter_all_positions())
+    
+    def iter_all_positions(self) -> Iterator[Dict]:
+        """Yield open positions one at a time, formatting each only when it is consumed"""
         if not self.connected:
-            return []
+            return
         
-        positions = mt5.positions_get()
-        if not positions:
-            return []
-        
-        result = []
-        for pos in positions:
-            result.append({
-                'ticket': pos.ticket,
-                'symbol': pos.symbol,
-                'type': 'BUY' if pos.type == mt5.ORDER_TYPE_BUY else 'SELL',
-                'volume': pos.volume,
-                'price_open': pos.price_open,
-                'price_current': pos.price_current,
-                'profit': pos.profit,
+        for pos in self._positions():
+            ticket, symbol, pos_type, volume, price_open, price_current, profit, opened = _POS_ATTRS(pos)
+            yield {
+                'ticket': ticket,
+                'symbol': symbol,
+                'type': _ORDER_TYPE_NAMES[pos_type],
+                'volume': volume,
+                'price_open': price_open,
+                'price_current': price_current,
+                'profit': profit,
                 'swap': getattr(pos, 'swap', 0.0),
                 'commission': getattr(pos, 'commission', 0.0),
-                'time': datetime.fromtimestamp(pos.time).strftime('%Y-%m-%d %H:%M:%S'),
-                'time_update': datetime.fromtimestamp(pos.time_update).strftime('%Y-%m-%d %H:%M:%S'),
+                'time': _fmt_ts(opened),
+                'time_update': _fmt_ts(pos.time_update),
                 'sl': pos.sl if pos.sl > 0 else None,
                 'tp': pos.tp if pos.tp > 0 else None
-            })
-        
-        return result
+            }
     
     def analyze_grid_dca(self, symbol: str = None) -> List[Dict]:
         """
@@ -728,14 +1200,14 @@ class MT5Monitor:
         if not self.connected:
             return []
 
-        positions = mt5.positions_get(symbol=symbol) if symbol else mt5.positions_get()
+        positions = self.positions_for(symbol) if symbol else self._positions()
         if not positions:
             return []
 
         # Group by (symbol, direction)
         groups: Dict[tuple, list] = {}
         for pos in positions:
-            direction = 'BUY' if pos.type == mt5.ORDER_TYPE_BUY else 'SELL'
+            direction = _ORDER_TYPE_NAMES[pos.type]
             key = (pos.symbol, direction)
             groups.setdefault(key, []).append(pos)
 
@@ -744,13 +1216,14 @@ class MT5Monitor:
             if len(group) < 2:
                 continue  # single position — not a grid/DCA
 
-            total_volume = sum(p.volume for p in group)
-            total_profit = sum(p.profit for p in group)
+            total_volume = sum(map(_VOLUME, group))
+            total_profit = sum(map(_PROFIT, group))
             # weighted average entry price
             avg_entry = sum(p.price_open * p.volume for p in group) / total_volume
 
-            symbol_info = mt5.symbol_info(sym)
-            digits = symbol_info.digits if symbol_info else 5
+            digits = self._digits(sym)
+            if digits is None:
+                digits = 5
 
             current_price = group[0].price_current  # same symbol, same current price
 
@@ -773,48 +1246,32 @@ class MT5Monitor:
 
     def get_all_orders(self) -> List[Dict]:
         """Get all pending orders"""
+        return list(self.iter_all_orders())
+    
+    def iter_all_orders(self) -> Iterator[Dict]:
+        """Yield pending orders one at a time, formatting each only when it is consumed"""
         if not self.connected:
-            return []
-        
-        orders = mt5.orders_get()
-        if not orders:
-            return []
+            return
         
-        order_type_map = {
-            mt5.ORDER_TYPE_BUY_LIMIT: 'BUY LIMIT',
-            mt5.ORDER_TYPE_SELL_LIMIT: 'SELL LIMIT',
-            mt5.ORDER_TYPE_BUY_STOP: 'BUY STOP',
-            mt5.ORDER_TYPE_SELL_STOP: 'SELL STOP',
-            mt5.ORDER_TYPE_BUY_STOP_LIMIT: 'BUY STOP LIMIT',
-            mt5.ORDER_TYPE_SELL_STOP_LIMIT: 'SELL STOP LIMIT'
-        }
-        
-        result = []
-        for order in orders:
-            result.append({
-                'ticket': order.ticket,
-                'symbol': order.symbol,
-                'type': order_type_map.get(order.type, 'UNKNOWN'),
-                'volume': order.volume_initial,
+        for order in self._orders():
+            ticket, symbol, order_type, volume, price_open, price_current, time_setup, time_expiration = _ORD_ATTRS(order)
+            yield {
+                'ticket': ticket,
+                'symbol': symbol,
+                'type': _order_type_name(order_type),
+                'volume': volume,
                 'volume_current': order.volume_current,
-                'price_open': order.price_open,
-                'price_current': order.price_current,
+                'price_open': price_open,
+                'price_current': price_current,
                 'sl': order.sl,
                 'tp': order.tp,
-                'time_setup': datetime.fromtimestamp(order.time_setup).strftime('%Y-%m-%d %H:%M:%S'),
-                'time_expiration': datetime.fromtimestamp(order.time_expiration).strftime('%Y-%m-%d %H:%M:%S') if order.time_expiration > 0 else None
-            })
-        
-        return result
+                'time_setup': _fmt_ts(time_setup),
+                'time_expiration': _fmt_ts(time_expiration) if time_expiration > 0 else None
+            }
     
-    def get_pl_summary(self, period: str = 'daily') -> Dict:
-        """Get profit/loss summary for a period (daily, weekly, monthly)"""
-        if not self.connected:
-            return {}
-        
-        from datetime import timedelta
-        import time
-        
+    @staticmethod
+    def _pl_window(period: str):
+        """Return (start datetime, start timestamp, end timestamp) for a P/L period"""
         now = datetime.now()
         
         if period == 'daily':
@@ -828,13 +1285,110 @@ class MT5Monitor:
         else:
             start_time = datetime(now.year, now.month, now.day)
         
-        start_timestamp = int(start_time.timestamp())
-        end_timestamp = int(datetime.now().timestamp())
+        return start_time, int(start_time.timestamp()), int(now.timestamp())
+    
+    def get_pl_summary(self, period: str = 'daily') -> Dict:
+        """Get profit/loss summary for a period (daily, weekly, monthly)"""
+        if not self.connected:
+            return {}
         
-        # Get deal history (returns tuple or None)
-        deals = mt5.history_deals_get(start_timestamp, end_timestamp)
+        start_time, start_timestamp, end_timestamp = self._pl_window(period)
         
-        if deals is None or len(deals) == 0:
+        # Deal history and open positions are independent; fetch them together
+        history, positions = self._submit_many(
+            (self._period_deals, period, start_timestamp, end_timestamp),
+            (self._positions,),
+        )
+        return self._build_pl_summary(period, start_time, history, positions)
+    
+    async def aget_pl_summary(self, period: str = 'daily') -> Dict:
+        """Async get_pl_summary: fetches deal history and open positions concurrently"""
+        if not self.connected:
+            return {}
+        
+        start_time, start_timestamp, end_timestamp = self._pl_window(period)
+        loop = asyncio.get_running_loop()
+        pool = self._executor()
+        history, positions = await asyncio.gather(
+            loop.run_in_executor(pool, self._period_deals, period, start_timestamp, end_timestamp),
+            loop.run_in_executor(pool, self._positions),
+        )
+        return self._build_pl_summary(period, start_time, history, positions)
+    
+    def _period_deals(self, period: str, start_timestamp: int, end_timestamp: int) -> Optional[Dict]:
+        """
+        Get the period's deals, fetching only those newer than the previous call
+        
+        The cache for a period is rebuilt when its start moves (a new day/week/month).
+        Otherwise only [last fetch, now] is requested; that range starts at the previous end
+        second (inclusive) so late deals stamped with it are not missed, and deals already
+        seen at that second are dropped by ticket.
+        
+        Returns:
+            Dict with 'deals' (list), the 'position_ids'/'entries'/'profits' columns and
+            'closed_profit' (running sum of exit-deal profit), or None if the history
+            could not be fetched
+        """
+        with self._pl_lock:
+            return self._advance_period_deals(period, start_timestamp, end_timestamp)
+    
+    def _advance_period_deals(self, period: str, start_timestamp: int, end_timestamp: int) -> Optional[Dict]:
+        """Fold deals up to end_timestamp into the period's cache (caller holds _pl_lock)"""
+        cache = self._pl_cache.get(period)
+        if cache is not None and cache['start_ts'] != start_timestamp:
+            cache = None
+        
+        fetch_from = start_timestamp if cache is None else cache['last_ts']
+        new_deals = mt5.history_deals_get(fetch_from, end_timestamp)
+        if new_deals is None:
+            return dict(cache) if cache is not None else None
+        
+        if cache is not None:
+            edge = cache['edge']
+            new_deals = [deal for deal in new_deals if deal.ticket not in edge]
+        
+        n = len(new_deals)
+        position_ids = np.fromiter(map(_POSITION_ID, new_deals), dtype=np.int64, count=n)
+        entries = np.fromiter(map(_ENTRY, new_deals), dtype=np.int64, count=n)
+        profits = np.fromiter(map(_PROFIT, new_deals), dtype=np.float64, count=n)
+        
+        closed_profit = float(profits[entries == _DEAL_OUT].sum())
+        
+        # Deals stamped with the new end second may be re-fetched by the next call
+        edge = {deal.ticket for deal in new_deals if deal.time >= end_timestamp}
+        if cache is None:
+            cache = self._pl_cache[period] = {
+                'start_ts': start_timestamp,
+                'deals': list(new_deals),
+                'position_ids': position_ids,
+                'entries': entries,
+                'profits': profits,
+                'closed_profit': closed_profit,
+            }
+        elif n:
+            cache['deals'].extend(new_deals)
+            cache['position_ids'] = np.concatenate((cache['position_ids'], position_ids))
+            cache['entries'] = np.concatenate((cache['entries'], entries))
+            cache['profits'] = np.concatenate((cache['profits'], profits))
+            cache['closed_profit'] += closed_profit
+        if cache.get('last_ts') == end_timestamp:
+            edge |= cache['edge']
+        cache['last_ts'] = end_timestamp
+        cache['edge'] = edge
+        # Shallow copy so later calls swapping in longer columns do not affect this caller
+        return dict(cache)
+    
+    def _closed_profit(self, period: str) -> float:
+        """Realized profit for a period, read from the incremental deal cache"""
+        _, start_timestamp, end_timestamp = self._pl_window(period)
+        history = self._period_deals(period, start_timestamp, end_timestamp)
+        return history['closed_profit'] if history else 0.0
+    
+    def _build_pl_summary(self, period: str, start_time: datetime, history: Optional[Dict],
+                          positions) -> Dict:
+        """Summarize the period's deals (see _period_deals) plus the current open-position profit"""
+        deals = history['deals'] if history else None
+        if not deals:
             return {
                 'period': period,
                 'total_profit': 0.0,
@@ -848,100 +1402,50 @@ class MT5Monitor:
                 'start_time': start_time.strftime('%Y-%m-%d %H:%M:%S')
             }
         
-        total_profit = 0.0
-        trades = {}
-        winning_trades = 0
-        losing_trades = 0
+        position_ids = history['position_ids']
+        entries = history['entries']
+        profits = history['profits']
+        
+        # Group deals by position ticket; only exit deals carry a trade's realized profit
+        is_out = entries == _DEAL_OUT
+        tickets, first_seen, group = np.unique(position_ids, return_index=True, return_inverse=True)
+        trade_profits = np.bincount(group, weights=np.where(is_out, profits, 0.0), minlength=len(tickets))
+        total_profit = float(profits[is_out].sum())
+        
+        wins = trade_profits > 0
+        losses = trade_profits < 0
+        winning_trades = int(np.count_nonzero(wins))
+        losing_trades = int(np.count_nonzero(losses))
+        total_trades = len(tickets)
+        
         largest_win = 0.0
         largest_loss = 0.0
         best_trade = None
         worst_trade = None
         
-        # Group deals by position ticket and collect detailed info
-        for deal in deals:
-            ticket = deal.position_id
-            if ticket not in trades:
-                trades[ticket] = {
-                    'profit': 0.0,
-                    'symbol': deal.symbol,
-                    'volume': 0.0,
-                    'entry_time': None,
-                    'exit_time': None,
-                    'entry_price': None,
-                    'exit_price': None,
-                    'commission': 0.0,
-                    'swap': 0.0,
-                    'type': None
-                }
-            
-            if deal.entry == mt5.DEAL_ENTRY_IN:
-                # Entry deal
-                trades[ticket]['entry_time'] = datetime.fromtimestamp(deal.time)
-                trades[ticket]['entry_price'] = deal.price
-                trades[ticket]['volume'] = deal.volume
-                trades[ticket]['type'] = 'BUY' if deal.type == mt5.DEAL_TYPE_BUY else 'SELL'
-            elif deal.entry == mt5.DEAL_ENTRY_OUT:
-                # Exit deal
-                trades[ticket]['exit_time'] = datetime.fromtimestamp(deal.time)
-                trades[ticket]['exit_price'] = deal.price
-                trades[ticket]['profit'] += deal.profit
-                trades[ticket]['commission'] += deal.commission
-                trades[ticket]['swap'] += deal.swap
-                total_profit += deal.profit
-        
-        # Analyze trades and find best/worst
-        for ticket, trade_info in trades.items():
-            profit = trade_info['profit']
-            
-            if profit > 0:
-                winning_trades += 1
-                if profit > largest_win:
-                    largest_win = profit
-                    best_trade = {
-                        'ticket': ticket,
-                        'symbol': trade_info['symbol'],
-                        'type': trade_info['type'],
-                        'profit': profit,
-                        'volume': trade_info['volume'],
-                        'entry_price': trade_info['entry_price'],
-                        'exit_price': trade_info['exit_price'],
-                        'entry_time': trade_info['entry_time'].strftime('%Y-%m-%d %H:%M:%S') if trade_info['entry_time'] else None,
-                        'exit_time': trade_info['exit_time'].strftime('%Y-%m-%d %H:%M:%S') if trade_info['exit_time'] else None,
-                        'duration': str(trade_info['exit_time'] - trade_info['entry_time']) if trade_info['entry_time'] and trade_info['exit_time'] else None,
-                        'commission': trade_info['commission'],
-                        'swap': trade_info['swap']
-                    }
-            elif profit < 0:
-                losing_trades += 1
-                if profit < largest_loss:
-                    largest_loss = profit
-                    worst_trade = {
-                        'ticket': ticket,
-                        'symbol': trade_info['symbol'],
-                        'type': trade_info['type'],
-                        'profit': profit,
-                        'volume': trade_info['volume'],
-                        'entry_price': trade_info['entry_price'],
-                        'exit_price': trade_info['exit_price'],
-                        'entry_time': trade_info['entry_time'].strftime('%Y-%m-%d %H:%M:%S') if trade_info['entry_time'] else None,
-                        'exit_time': trade_info['exit_time'].strftime('%Y-%m-%d %H:%M:%S') if trade_info['exit_time'] else None,
-                        'duration': str(trade_info['exit_time'] - trade_info['entry_time']) if trade_info['entry_time'] and trade_info['exit_time'] else None,
-                        'commission': trade_info['commission'],
-                        'swap': trade_info['swap']
-                    }
+        # Best/worst trade: ties go to the position whose first deal came earliest
+        if winning_trades:
+            largest_win = float(trade_profits[wins].max())
+            best = np.flatnonzero(trade_profits == largest_win)
+            best = best[np.argmin(first_seen[best])]
+            best_trade = self._trade_summary(deals, np.flatnonzero(group == best), largest_win)
+        if losing_trades:
+            largest_loss = float(trade_profits[losses].min())
+            worst = np.flatnonzero(trade_profits == largest_loss)
+            worst = worst[np.argmin(first_seen[worst])]
+            worst_trade = self._trade_summary(deals, np.flatnonzero(group == worst), largest_loss)
         
         # Get current open positions profit
-        positions = mt5.positions_get()
-        open_profit = sum(pos.profit for pos in positions) if positions else 0.0
+        open_profit = self._open_profit(positions)
         
         return {
             'period': period,
             'total_profit': total_profit,
             'open_profit': open_profit,
-            'total_trades': len(trades),
+            'total_trades': total_trades,
             'winning_trades': winning_trades,
             'losing_trades': losing_trades,
-            'win_rate': (winning_trades / len(trades) * 100) if trades else 0.0,
+            'win_rate': (winning_trades / total_trades * 100) if total_trades else 0.0,
             'largest_win': largest_win,
             'largest_loss': largest_loss,
             'best_trade': best_trade,
@@ -949,28 +1453,46 @@ class MT5Monitor:
             'start_time': start_time.strftime('%Y-%m-%d %H:%M:%S')
         }
     
+    @staticmethod
+    def _trade_summary(deals, indices, profit: float) -> Dict:
+        """Build the best/worst trade dict for one position from its deals (given by index)"""
+        symbol = deals[indices[0]].symbol
+        entry_time = exit_time = entry_price = exit_price = trade_type = None
+        volume = commission = swap = 0.0
+        for i in indices:
+            deal = deals[i]
+            if deal.entry == _DEAL_IN:
+                entry_time = deal.time
+                entry_price = deal.price
+                volume = deal.volume
+                trade_type = 'BUY' if deal.type == _DEAL_BUY else 'SELL'
+            elif deal.entry == _DEAL_OUT:
+                exit_time = deal.time
+                exit_price = deal.price
+                commission += deal.commission
+                swap += deal.swap
+        
+        return {
+            'ticket': deals[indices[0]].position_id,
+            'symbol': symbol,
+            'type': trade_type,
+            'profit': profit,
+            'volume': volume,
+            'entry_price': entry_price,
+            'exit_price': exit_price,
+            'entry_time': _fmt_ts(entry_time) if entry_time is not None else None,
+            'exit_time': _fmt_ts(exit_time) if exit_time is not None else None,
+            'duration': _fmt_duration(entry_time, exit_time),
+            'commission': commission,
+            'swap': swap
+        }
+    
     def get_trade_statistics(self, period: str = 'daily') -> Dict:
         """Get comprehensive trade statistics for a period"""
         if not self.connected:
             return {}
         
-        from datetime import timedelta
-        
-        now = datetime.now()
-        
-        if period == 'daily':
-            start_time = datetime(now.year, now.month, now.day)
-        elif period == 'weekly':
-            days_since_monday = now.weekday()
-            start_time = datetime(now.year, now.month, now.day) - timedelta(days=days_since_monday)
-        elif period == 'monthly':
-            start_time = datetime(now.year, now.month, 1)
-        else:
-            start_time = datetime(now.year, now.month, now.day)
-        
-        start_timestamp = int(start_time.timestamp())
-        end_timestamp = int(datetime.now().timestamp())
-        
+        start_time, start_timestamp, end_timestamp = self._pl_window(period)
         deals = mt5.history_deals_get(start_timestamp, end_timestamp)
         
         if deals is None or len(deals) == 0:
@@ -993,117 +1515,62 @@ class MT5Monitor:
                 'start_time': start_time.strftime('%Y-%m-%d %H:%M:%S')
             }
         
-        trades = {}
-        total_profit = 0.0
-        total_commission = 0.0
-        total_swap = 0.0
-        total_volume = 0.0
-        winning_profit = 0.0
-        losing_profit = 0.0
-        
-        # Process deals
-        for deal in deals:
-            ticket = deal.position_id
-            if ticket not in trades:
-                trades[ticket] = {
-                    'profit': 0.0,
-                    'symbol': deal.symbol,
-                    'volume': 0.0,
-                    'entry_time': None,
-                    'exit_time': None,
-                    'entry_price': None,
-                    'exit_price': None,
-                    'commission': 0.0,
-                    'swap': 0.0,
-                    'type': None
-                }
-            
-            if deal.entry == mt5.DEAL_ENTRY_IN:
-                trades[ticket]['entry_time'] = datetime.fromtimestamp(deal.time)
-                trades[ticket]['entry_price'] = deal.price
-                trades[ticket]['volume'] = deal.volume
-                trades[ticket]['type'] = 'BUY' if deal.type == mt5.DEAL_TYPE_BUY else 'SELL'
-                total_volume += deal.volume
-            elif deal.entry == mt5.DEAL_ENTRY_OUT:
-                trades[ticket]['exit_time'] = datetime.fromtimestamp(deal.time)
-                trades[ticket]['exit_price'] = deal.price
-                trades[ticket]['profit'] += deal.profit
-                trades[ticket]['commission'] += deal.commission
-                trades[ticket]['swap'] += deal.swap
-                total_profit += deal.profit
-                total_commission += deal.commission
-                total_swap += deal.swap
+        # Pull the numeric deal fields into columns in one pass; position tickets are far below
+        # 2**53, so the float64 block holds them exactly
+        columns = np.array(list(map(_DEAL_STAT_ATTRS, deals)), dtype=np.float64).reshape(len(deals), 6)
+        position_ids = columns[:, 0].astype(np.int64)
+        entries, profits, commissions, swaps, volumes = columns[:, 1:].T
+        
+        # Group deals by position ticket: entry deals carry the volume, exit deals the
+        # realized profit, commission and swap
+        is_in = entries == _DEAL_IN
+        is_out = entries == _DEAL_OUT
+        tickets, first_seen, group = np.unique(position_ids, return_index=True, return_inverse=True)
+        trade_profits = np.bincount(group, weights=np.where(is_out, profits, 0.0), minlength=len(tickets))
+        total_trades = len(tickets)
+        total_profit = float(profits[is_out].sum())
+        total_commission = float(commissions[is_out].sum())
+        total_swap = float(swaps[is_out].sum())
+        total_volume = float(volumes[is_in].sum())
         
         # Analyze trades
-        winning_trades = 0
-        losing_trades = 0
-        break_even_trades = 0
+        wins = trade_profits > 0
+        losses = trade_profits < 0
+        winning_trades = int(np.count_nonzero(wins))
+        losing_trades = int(np.count_nonzero(losses))
+        break_even_trades = total_trades - winning_trades - losing_trades
+        winning_profit = float(trade_profits[wins].sum())
+        losing_profit = float(-trade_profits[losses].sum())
         best_trade = None
         worst_trade = None
-        wins = []
-        losses = []
         
-        for ticket, trade_info in trades.items():
-            profit = trade_info['profit']
-            
-            if profit > 0:
-                winning_trades += 1
-                winning_profit += profit
-                wins.append(profit)
-                
-                if best_trade is None or profit > best_trade['profit']:
-                    best_trade = {
-                        'ticket': ticket,
-                        'symbol': trade_info['symbol'],
-                        'type': trade_info['type'],
-                        'profit': profit,
-                        'volume': trade_info['volume'],
-                        'entry_price': trade_info['entry_price'],
-                        'exit_price': trade_info['exit_price'],
-                        'entry_time': trade_info['entry_time'].strftime('%Y-%m-%d %H:%M:%S') if trade_info['entry_time'] else None,
-                        'exit_time': trade_info['exit_time'].strftime('%Y-%m-%d %H:%M:%S') if trade_info['exit_time'] else None,
-                        'duration': str(trade_info['exit_time'] - trade_info['entry_time']) if trade_info['entry_time'] and trade_info['exit_time'] else None,
-                        'commission': trade_info['commission'],
-                        'swap': trade_info['swap']
-                    }
-            elif profit < 0:
-                losing_trades += 1
-                losing_profit += abs(profit)
-                losses.append(profit)
-                
-                if worst_trade is None or profit < worst_trade['profit']:
-                    worst_trade = {
-                        'ticket': ticket,
-                        'symbol': trade_info['symbol'],
-                        'type': trade_info['type'],
-                        'profit': profit,
-                        'volume': trade_info['volume'],
-                        'entry_price': trade_info['entry_price'],
-                        'exit_price': trade_info['exit_price'],
-                        'entry_time': trade_info['entry_time'].strftime('%Y-%m-%d %H:%M:%S') if trade_info['entry_time'] else None,
-                        'exit_time': trade_info['exit_time'].strftime('%Y-%m-%d %H:%M:%S') if trade_info['exit_time'] else None,
-                        'duration': str(trade_info['exit_time'] - trade_info['entry_time']) if trade_info['entry_time'] and trade_info['exit_time'] else None,
-                        'commission': trade_info['commission'],
-                        'swap': trade_info['swap']
-                    }
-            else:
-                break_even_trades += 1
+        # Best/worst trade: ties go to the position whose first deal came earliest
+        if winning_trades:
+            best_profit = float(trade_profits[wins].max())
+            best = np.flatnonzero(trade_profits == best_profit)
+            best = best[np.argmin(first_seen[best])]
+            best_trade = self._trade_summary(deals, np.flatnonzero(group == best), best_profit)
+        if losing_trades:
+            worst_profit = float(trade_profits[losses].min())
+            worst = np.flatnonzero(trade_profits == worst_profit)
+            worst = worst[np.argmin(first_seen[worst])]
+            worst_trade = self._trade_summary(deals, np.flatnonzero(group == worst), worst_profit)
         
         # Calculate statistics
-        win_rate = (winning_trades / len(trades) * 100) if trades else 0.0
+        win_rate = winning_trades / total_trades * 100
         average_win = (winning_profit / winning_trades) if winning_trades > 0 else 0.0
         average_loss = (losing_profit / losing_trades) if losing_trades > 0 else 0.0
         profit_factor = (winning_profit / losing_profit) if losing_profit > 0 else (winning_profit if winning_profit > 0 else 0.0)
         
         # Get current open positions profit
-        positions = mt5.positions_get()
-        open_profit = sum(pos.profit for pos in positions) if positions else 0.0
+        positions = self._positions()
+        open_profit = self._open_profit(positions)
         
         return {
             'period': period,
             'total_profit': total_profit,
             'open_profit': open_profit,
-            'total_trades': len(trades),
+            'total_trades': total_trades,
             'winning_trades': winning_trades,
             'losing_trades': losing_trades,
             'break_even_trades': break_even_trades,
@@ -1135,7 +1602,7 @@ class MT5Monitor:
         if not self.connected:
             return None
         
-        account_info = mt5.account_info()
+        account_info = self._account()
         if not account_info:
             return None
         
@@ -1151,35 +1618,31 @@ class MT5Monitor:
         
         margin_level = account_info.margin_level
         
+        # Healthy accounts clear both thresholds with a single comparison
+        if margin_level > max(warning_threshold, critical_threshold):
+            return None
+        
         if margin_level <= critical_threshold:
-            return {
-                'type': 'critical',
-                'margin_level': margin_level,
-                'threshold': critical_threshold,
-                'balance': account_info.balance,
-                'equity': account_info.equity,
-                'margin': account_info.margin,
-                'free_margin': account_info.margin_free
-            }
-        elif margin_level <= warning_threshold:
-            return {
-                'type': 'warning',
-                'margin_level': margin_level,
-                'threshold': warning_threshold,
-                'balance': account_info.balance,
-                'equity': account_info.equity,
-                'margin': account_info.margin,
-                'free_margin': account_info.margin_free
-            }
+            alert_type, threshold = 'critical', critical_threshold
+        else:
+            alert_type, threshold = 'warning', warning_threshold
         
-        return None
+        return {
+            'type': alert_type,
+            'margin_level': margin_level,
+            'threshold': threshold,
+            'balance': account_info.balance,
+            'equity': account_info.equity,
+            'margin': account_info.margin,
+            'free_margin': account_info.margin_free
+        }
     
     def check_position_sizes(self, max_size_pct: float) -> List[Dict]:
         """Check if any positions exceed maximum size percentage of account"""
         if not self.connected:
             return []
         
-        account_info = mt5.account_info()
+        account_info = self._account()
         if not account_info:
             return []
         
@@ -1187,48 +1650,39 @@ class MT5Monitor:
         if balance <= 0:
             return []
         
-        positions = mt5.positions_get()
+        positions = self._positions()
         if not positions:
             return []
         
         alerts = []
-        # Use margin per position from account (more efficient than calculating)
-        # Total margin / number of positions gives approximate margin per position
-        # But MT5 doesn't expose per-position margin directly, so we use volume as proxy
-        # Position size % can be approximated by volume * price_open relative to balance
-        
-        for pos in positions:
-            # Simplified calculation using volume and price as proxy
-            # This is faster and avoids symbol_info lookup for each position
-            position_value_approx = pos.volume * pos.price_open
-            
-            # Rough estimate: for most instruments, this gives a reasonable approximation
-            # For precise calculation, we'd need symbol_info but that's slow
-            # Using equity instead of balance for more accurate representation
-            equity = account_info.equity if account_info.equity > 0 else balance
-            position_size_pct = (position_value_approx / equity * 100) if equity > 0 else 0
-            
-            # More conservative check - if approximate exceeds limit, flag it
-            if position_size_pct > max_size_pct:
-                # Only do expensive symbol_info lookup if we're close to the limit
-                symbol_info = mt5.symbol_info(pos.symbol)
-                if symbol_info:
-                    contract_size = getattr(symbol_info, 'trade_contract_size', 1)
-                    leverage = account_info.leverage
-                    position_value = pos.volume * pos.price_open * contract_size
-                    margin_used = position_value / leverage if leverage > 0 else position_value
-                    position_size_pct = (margin_used / balance * 100) if balance > 0 else 0
-                    
-                    if position_size_pct > max_size_pct:
-                        alerts.append({
-                            'symbol': pos.symbol,
-                            'ticket': pos.ticket,
-                            'volume': pos.volume,
-                            'position_size_pct': round(position_size_pct, 2),
-                            'max_size_pct': max_size_pct,
-                            'margin_used': margin_used,
-                            'balance': balance
-                        })
+        # MT5 doesn't expose per-position margin directly, so volume * price_open relative to
+        # equity is used as a cheap proxy to pick out candidates for the exact check
+        n = len(positions)
+        volumes = np.fromiter(map(_VOLUME, positions), dtype=np.float64, count=n)
+        prices = np.fromiter(map(_PRICE_OPEN, positions), dtype=np.float64, count=n)
+        equity = account_info.equity if account_info.equity > 0 else balance
+        flagged = np.flatnonzero(volumes * prices > max_size_pct * equity / 100)
+        
+        for i in flagged.tolist():
+            pos = positions[i]
+            # Exact check (contract size) only for positions over the approximate limit
+            contract_size = self._contract_size(pos.symbol)
+            if contract_size is not None:
+                leverage = account_info.leverage
+                position_value = pos.volume * pos.price_open * contract_size
+                margin_used = position_value / leverage if leverage > 0 else position_value
+                position_size_pct = (margin_used / balance * 100) if balance > 0 else 0
+                
+                if position_size_pct > max_size_pct:
+                    alerts.append({
+                        'symbol': pos.symbol,
+                        'ticket': pos.ticket,
+                        'volume': pos.volume,
+                        'position_size_pct': round(position_size_pct, 2),
+                        'max_size_pct': max_size_pct,
+                        'margin_used': margin_used,
+                        'balance': balance
+                    })
         
         return alerts
     
@@ -1237,13 +1691,13 @@ class MT5Monitor:
         if not self.connected:
             return None
         
-        account_info = mt5.account_info()
+        account_info = self._account()
         if not account_info:
             return None
         
         # Fast path: Check open positions profit first (no history query needed)
-        positions = mt5.positions_get()
-        open_profit = sum(pos.profit for pos in positions) if positions else 0.0
+        positions = self._positions()
+        open_profit = self._open_profit(positions)
         balance = account_info.balance
         
         # Quick check: If open profit is positive and well above any loss threshold, skip expensive query
@@ -1254,9 +1708,9 @@ class MT5Monitor:
                 # Open profit is positive and large, likely no loss limit breached
                 return None
         
-        # Need to check closed trades (slower query) - only when necessary
-        summary = self.get_pl_summary(period='daily')
-        total_profit = summary.get('total_profit', 0) if summary else 0
+        # Need to check closed trades - only when necessary; this only folds in deals newer
+        # than the last poll and needs no per-trade aggregation
+        total_profit = self._closed_profit('daily')
         total_pl = total_profit + open_profit
         
         # Check if we have a loss
@@ -1294,27 +1748,43 @@ class MT5Monitor:
         return alert
     
     def check_drawdown(self, drawdown_limit_pct: float, initial_balance: float = None) -> Optional[Dict]:
-        """Check if current drawdown exceeds limit from initial balance"""
+        """
+        Check if current drawdown exceeds limit
+        
+        Args:
+            drawdown_limit_pct: Drawdown limit (%)
+            initial_balance: Reference balance to measure drawdown from; if None, drawdown is
+                measured peak-to-trough from the highest equity this monitor has seen
+        
+        Returns:
+            Alert dictionary if drawdown is at or over the limit, None otherwise
+        """
         if not self.connected:
             return None
         
-        account_info = mt5.account_info()
+        account_info = self._account()
         if not account_info:
             return None
         
         current_balance = account_info.balance
         equity = account_info.equity
         
-        # Use provided initial balance or current balance if not provided
-        if initial_balance is None:
-            initial_balance = current_balance
+        # Track the equity high-water mark; a new high cannot be a peak-to-trough drawdown
+        if equity >= self._equity_peak:
+            self._equity_peak = equity
+            if initial_balance is None:
+                return None
+        
+        from_peak = initial_balance is None
+        if from_peak:
+            initial_balance = self._equity_peak
         
         if initial_balance <= 0:
             return None
         
         # Calculate drawdown from equity (worst case)
         drawdown_amount = initial_balance - equity
-        drawdown_pct = (drawdown_amount / initial_balance * 100) if initial_balance > 0 else 0
+        drawdown_pct = drawdown_amount / initial_balance * 100
         
         if drawdown_pct >= drawdown_limit_pct:
             return {
@@ -1324,7 +1794,8 @@ class MT5Monitor:
                 'initial_balance': initial_balance,
                 'current_balance': current_balance,
                 'equity': equity,
-                'profit': equity - initial_balance
+                'profit': equity - initial_balance,
+                'from_peak': from_peak
             }
         
         return None
@@ -1387,6 +1858,7 @@ class MT5Monitor:
         
         # Send order
         result = mt5.order_send(request)
+        self.mark_dirty('positions')
         
         if result is None:
             return {
@@ -1421,8 +1893,8 @@ class MT5Monitor:
         if not self.connected:
             return {'success': False, 'error': 'Not connected to MT5'}
         
-        positions = mt5.positions_get()
-        if not positions or len(positions) == 0:
+        positions = self._positions()
+        if not positions:
             return {
                 'success': True,
                 'closed_count': 0,
@@ -1479,6 +1951,8 @@ class MT5Monitor:
 
         result = mt5.order_send(request)
 
+        self.mark_dirty('orders')
+
         if result is None:
             return {
                 'success': False,
@@ -1511,8 +1985,8 @@ class MT5Monitor:
         if not self.connected:
             return {'success': False, 'error': 'Not connected to MT5'}
 
-        orders = mt5.orders_get()
-        if not orders or len(orders) == 0:
+        orders = self._orders()
+        if not orders:
             return {
                 'success': True,
                 'cancelled_count': 0,
@@ -1667,6 +2141,7 @@ class MT5Monitor:
         
         # Send order
         result = mt5.order_send(request)
+        self.mark_dirty('positions')
         
         if result is None:
             return {
@@ -1816,6 +2291,7 @@ class MT5Monitor:
 
         # Send order
         result = mt5.order_send(request)
+        self.mark_dirty('positions')
         
         if result is None:
             return {
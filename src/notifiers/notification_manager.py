@@ -17,29 +17,65 @@ class AlertPriority(Enum):
     NORMAL = "normal"
 
 
+# Message prefix (indicator plus separating space) per (priority, channel), built once
+_PRIORITY_INDICATORS = {
+    AlertPriority.CRITICAL: {
+        'telegram': '🚨',
+        'discord': '🔴',
+        'email': '[CRITICAL]',
+        'webhook': 'CRITICAL'
+    },
+    AlertPriority.IMPORTANT: {
+        'telegram': '⚠️',
+        'discord': '🟡',
+        'email': '[IMPORTANT]',
+        'webhook': 'IMPORTANT'
+    },
+    AlertPriority.NORMAL: {
+        'telegram': 'ℹ️',
+        'discord': '🔵',
+        'email': '',
+        'webhook': 'NORMAL'
+    }
+}
+_PRIORITY_PREFIXES = {
+    (priority, channel): f"{indicator} "
+    for priority, indicators in _PRIORITY_INDICATORS.items()
+    for channel, indicator in indicators.items()
+    if indicator
+}
+
+
 class NotificationManager:
     """Manages notifications across multiple channels"""
     
     def __init__(self):
         self.channels = {}
-        self.enabled_channels = set()
+        # Channel name -> (supports send_message_with_image, supports send_message), set on registration
+        self._capabilities = {}
+        # Replaced (never mutated) on enable/disable, so a send can iterate it without copying
+        self.enabled_channels = frozenset()
     
     def register_channel(self, name: str, channel: Any):
         """Register a notification channel"""
         self.channels[name] = channel
+        self._capabilities[name] = (
+            hasattr(channel, 'send_message_with_image'),
+            hasattr(channel, 'send_message')
+        )
         logger.info(f"Registered notification channel: {name}")
     
     def enable_channel(self, name: str):
         """Enable a notification channel"""
         if name in self.channels:
-            self.enabled_channels.add(name)
+            self.enabled_channels = self.enabled_channels | {name}
             logger.info(f"Enabled notification channel: {name}")
         else:
             logger.warning(f"Channel {name} not registered")
     
     def disable_channel(self, name: str):
         """Disable a notification channel"""
-        self.enabled_channels.discard(name)
+        self.enabled_channels = self.enabled_channels - {name}
         logger.info(f"Disabled notification channel: {name}")
     
     async def send_notification(
@@ -65,46 +101,57 @@ class NotificationManager:
         Returns:
             Dictionary mapping channel names to success status
         """
-        results = {}
-        target_channels = channels if channels else list(self.enabled_channels)
+        target_channels = channels or self.enabled_channels
         
-        for channel_name in target_channels:
-            if channel_name not in self.channels:
-                logger.warning(f"Channel {channel_name} not registered")
-                results[channel_name] = False
-                continue
-            
-            channel = self.channels[channel_name]
-            try:
-                # Try to send with image if provided
-                if image_data and hasattr(channel, 'send_message_with_image'):
-                    success = await channel.send_message_with_image(
-                        message=message,
-                        priority=priority,
-                        title=title,
-                        image_data=image_data,
-                        image_filename=image_filename
-                    )
-                elif hasattr(channel, 'send_message'):
-                    # Fallback to text-only
-                    # Don't format priority for Telegram - it handles its own formatting
-                    if channel_name == 'telegram':
-                        formatted_message = f"{title}\n\n{message}" if title else message
-                    else:
-                        formatted_message = self._format_message_with_priority(
-                            message, priority, title, channel_name
-                        )
-                    success = await channel.send_message(formatted_message, priority=priority)
-                else:
-                    logger.warning(f"Channel {channel_name} doesn't support send_message")
-                    success = False
-                
-                results[channel_name] = success
-            except Exception as e:
-                logger.error(f"Error sending notification to {channel_name}: {e}")
-                results[channel_name] = False
+        # Send to every channel concurrently so the slowest channel bounds the latency
+        sends = [
+            self._send_to_channel(channel_name, message, priority, title, image_data, image_filename)
+            for channel_name in target_channels
+        ]
+        return dict(zip(target_channels, await asyncio.gather(*sends)))
+    
+    async def _send_to_channel(
+        self,
+        channel_name: str,
+        message: str,
+        priority: AlertPriority,
+        title: Optional[str],
+        image_data: Optional[bytes],
+        image_filename: Optional[str]
+    ) -> bool:
+        """Send one notification to one channel, returning its success status"""
+        channel = self.channels.get(channel_name)
+        if channel is None:
+            logger.warning(f"Channel {channel_name} not registered")
+            return False
         
-        return results
+        can_send_image, can_send_text = self._capabilities[channel_name]
+        try:
+            # Try to send with image if provided
+            if image_data and can_send_image:
+                return await channel.send_message_with_image(
+                    message=message,
+                    priority=priority,
+                    title=title,
+                    image_data=image_data,
+                    image_filename=image_filename
+                )
+            elif can_send_text:
+                # Fallback to text-only
+                # Don't format priority for Telegram - it handles its own formatting
+                if channel_name == 'telegram':
+                    formatted_message = f"{title}\n\n{message}" if title else message
+                else:
+                    formatted_message = self._format_message_with_priority(
+                        message, priority, title, channel_name
+                    )
+                return await channel.send_message(formatted_message, priority=priority)
+            else:
+                logger.warning(f"Channel {channel_name} doesn't support send_message")
+                return False
+        except Exception as e:
+            logger.error(f"Error sending notification to {channel_name}: {e}")
+            return False
     
     def _format_message_with_priority(
         self,
@@ -114,29 +161,7 @@ class NotificationManager:
         channel: str
     ) -> str:
         """Format message with priority indicators based on channel"""
-        priority_indicators = {
-            AlertPriority.CRITICAL: {
-                'telegram': '🚨',
-                'discord': '🔴',
-                'email': '[CRITICAL]',
-                'webhook': 'CRITICAL'
-            },
-            AlertPriority.IMPORTANT: {
-                'telegram': '⚠️',
-                'discord': '🟡',
-                'email': '[IMPORTANT]',
-                'webhook': 'IMPORTANT'
-            },
-            AlertPriority.NORMAL: {
-                'telegram': 'ℹ️',
-                'discord': '🔵',
-                'email': '',
-                'webhook': 'NORMAL'
-            }
-        }
-        
-        indicator = priority_indicators.get(priority, {}).get(channel, '')
-        prefix = f"{indicator} " if indicator else ""
+        prefix = _PRIORITY_PREFIXES.get((priority, channel), '')
         
         if title:
             return f"{prefix}{title}\n\n{message}"
@@ -749,7 +749,7 @@ class TelegramNotifier:
             await update.message.reply_text("❌ MT5 monitor not available.")
             return
         
-        account_info = self.mt5_monitor.get_account_info()
+        account_info = await self.mt5_monitor.aget_account_info()
         message = self.format_status(account_info)
         await update.message.reply_text(message, parse_mode='HTML')
     
@@ -797,7 +797,7 @@ class TelegramNotifier:
             if period_arg in ['daily', 'weekly', 'monthly']:
                 period = period_arg
         
-        summary = self.mt5_monitor.get_pl_summary(period=period)
+        summary = await self.mt5_monitor.aget_pl_summary(period=period)
         message = self.format_summary(summary)
         await update.message.reply_text(message, parse_mode='HTML')
     
@@ -1245,10 +1245,7 @@ class TelegramNotifier:
         try:
             from ..analytics.economic_calendar import get_currencies_from_symbols
             if not currencies and self.mt5_monitor:
-                import MetaTrader5 as mt5
-                positions = mt5.positions_get() or []
-                orders = mt5.orders_get() or []
-                symbols = {p.symbol for p in positions} | {o.symbol for o in orders}
+                symbols = self.mt5_monitor.get_active_instruments()
                 currencies = get_currencies_from_symbols(list(symbols))
 
             events = self.economic_calendar.get_events_for_display(
@@ -1725,7 +1722,8 @@ class TelegramNotifier:
         message += f"Drawdown: {alert.get('drawdown_pct', 0):.2f}%\n"
         message += f"Limit: {alert.get('limit_pct', 0):.2f}%\n"
         message += f"Drawdown Amount: {alert.get('drawdown_amount', 0):.2f}\n\n"
-        message += f"Initial Balance: {alert.get('initial_balance', 0):.2f}\n"
+        reference_label = "Equity Peak" if alert.get('from_peak') else "Initial Balance"
+        message += f"{reference_label}: {alert.get('initial_balance', 0):.2f}\n"
         message += f"Current Balance: {alert.get('current_balance', 0):.2f}\n"
         message += f"Equity: {alert.get('equity', 0):.2f}\n"
         message += f"Total P/L: {alert.get('profit', 0):.2f}\n\n"
@@ -2,10 +2,15 @@
 MT5 Alert Service - Main service class for monitoring and alerting
 """
 import asyncio
+import copy
 import logging
+import signal
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
+import MetaTrader5 as mt5
+
 from ..core.alert_management import AlertRateLimiter, AlertGrouper, QuietHours
 from ..monitoring.mt5_monitor import MT5Monitor
 from ..notifiers.telegram_bot import TelegramNotifier
@@ -18,6 +23,7 @@ from ..analytics.volatility_calculator import VolatilityCalculator
 from ..analytics.economic_calendar import EconomicCalendar, get_currencies_from_symbols
 from ..analytics.correlation_tracker import CorrelationTracker
 from ..utils.config import Config
+from ..utils.levels_utils import merge_dynamic_levels
 
 # Optional imports for Discord and Webhook (require aiohttp)
 try:
@@ -40,6 +46,7 @@ class MT5AlertService:
         self.telegram = None
         self.running = False
         self.price_levels = {}
+        self.compiled_levels = {}  # symbol -> LevelsArray, rebuilt whenever price_levels is loaded or saved
         self.triggered_levels = set()
         self.monitored_symbols = set()
         self.sent_profit_suggestions = set()  # Track sent suggestions to avoid spam
@@ -47,6 +54,7 @@ class MT5AlertService:
         self.initial_balance = None  # Track initial balance for drawdown calculation
         self.last_daily_summary_date = None  # Track last date daily summary was sent
         self.last_dynamic_levels_update = None  # Track last dynamic levels update time
+        self.last_levels_sweep_date = None  # Track last date expired levels were swept
         self.breakeven_applied = set()  # Tickets that have had auto break-even applied
         self.trailing_stops = {}  # {ticket: distance_price_units} for software trailing stops
 
@@ -83,14 +91,12 @@ class MT5AlertService:
         if self.config.ENABLE_ML_PROFIT_SUGGESTIONS and self.trade_db:
             self.ml_analyzer = MLProfitAnalyzer(
                 trade_db=self.trade_db,
-                min_trades_for_learning=self.config.ML_MIN_TRADES_FOR_LEARNING
+                min_trades_for_learning=self.config.ML_MIN_TRADES_FOR_LEARNING,
+                learning_workers=self.config.ML_LEARNING_WORKERS,
+                balance_provider=self._account_balance,
+                cache_path=self.config.ML_PATTERN_CACHE_PATH or None,
+                cache_ttl=timedelta(hours=self.config.ML_PATTERN_CACHE_TTL_HOURS)
             )
-            # Learn from history on startup
-            try:
-                self.ml_analyzer.learn_from_history()
-                logger.info("ML Profit Analyzer initialized and learned from trade history")
-            except Exception as e:
-                logger.error(f"Error initializing ML analyzer: {e}")
         
         # Volatility Calculator
         self.volatility_calc = None
@@ -119,6 +125,9 @@ class MT5AlertService:
 
         # Notification Manager (will be initialized after telegram is set)
         self.notification_manager = None
+
+        # Interactive price level menu running alongside monitoring
+        self._level_manager_task = None
     
     def _record_trade_to_db(self, trade: Dict):
         """Record a closed trade to the database"""
@@ -181,16 +190,22 @@ class MT5AlertService:
             }
             
             self.trade_db.add_trade(trade_data)
-            logger.debug(f"Recorded trade {trade.get('ticket')} to database")
+            logger.debug("Recorded trade %s to database", trade.get('ticket'))
         except Exception as e:
-            logger.error(f"Error recording trade to database: {e}")
+            logger.error("Error recording trade to database: %s", e)
+    
+    def _account_balance(self) -> float:
+        """Current account balance, or 0 while MT5 is not connected"""
+        if self.mt5_monitor and self.mt5_monitor.connected:
+            return self.mt5_monitor.get_balance()
+        return 0.0
     
     async def initialize(self):
         """Initialize MT5 and Telegram connections"""
         # Validate configuration
         valid, error = self.config.validate()
         if not valid:
-            logger.error(f"Configuration error: {error}")
+            logger.error("Configuration error: %s", error)
             return False
         
         # Initialize MT5
@@ -205,6 +220,16 @@ class MT5AlertService:
         if not self.mt5_monitor.connect():
             logger.error("Failed to connect to MT5")
             return False
+        MT5Monitor.set_shared(self.mt5_monitor)
+        
+        # Learn from history on startup (after connecting so the real balance is used),
+        # unless patterns restored from the cache are still current
+        if self.ml_analyzer:
+            try:
+                self.ml_analyzer.ensure_learned()
+                logger.info("ML Profit Analyzer initialized and learned from trade history")
+            except Exception as e:
+                logger.error("Error initializing ML analyzer: %s", e)
         
         # Initialize Telegram
         logger.info("Initializing Telegram bot...")
@@ -257,7 +282,7 @@ class MT5AlertService:
                     self.notification_manager.enable_channel('discord')
                     logger.info("Discord notifications enabled")
                 except Exception as e:
-                    logger.error(f"Failed to initialize Discord notifier: {e}")
+                    logger.error("Failed to initialize Discord notifier: %s", e)
         
         # Register Email channel if enabled
         if (self.config.ENABLE_EMAIL_NOTIFICATIONS and self.config.EMAIL_SMTP_SERVER and 
@@ -275,7 +300,7 @@ class MT5AlertService:
                 self.notification_manager.enable_channel('email')
                 logger.info("Email notifications enabled")
             except Exception as e:
-                logger.error(f"Failed to initialize Email notifier: {e}")
+                logger.error("Failed to initialize Email notifier: %s", e)
         
         # Register Webhook channel if enabled
         if self.config.ENABLE_WEBHOOK_NOTIFICATIONS and self.config.WEBHOOK_URL:
@@ -295,25 +320,26 @@ class MT5AlertService:
                     self.notification_manager.enable_channel('webhook')
                     logger.info("Webhook notifications enabled")
                 except Exception as e:
-                    logger.error(f"Failed to initialize Webhook notifier: {e}")
+                    logger.error("Failed to initialize Webhook notifier: %s", e)
         
         # Load price levels
         self.price_levels = self.config.load_price_levels()
+        self.compiled_levels = Config.compile_levels(self.price_levels)
         if self.price_levels:
-            logger.info(f"Loaded price levels for {len(self.price_levels)} symbols")
+            logger.info("Loaded price levels for %s symbols", len(self.price_levels))
             # Initialize triggered_levels with levels that are already crossed
             # This prevents alerts on startup for levels that were already crossed
             await self._initialize_triggered_levels()
         
         # Initialize monitored symbols from config
         self.monitored_symbols = set(self.config.MONITORED_SYMBOLS)
-        logger.info(f"Monitoring synthetic indices: {', '.join(self.monitored_symbols)}")
+        logger.info("Monitoring synthetic indices: %s", ', '.join(self.monitored_symbols))
         
         # Store initial balance for drawdown calculation
         account_info = self.mt5_monitor.get_account_info()
         if account_info:
             self.initial_balance = account_info.get('balance', 0)
-            logger.info(f"Initial balance tracked: {self.initial_balance}")
+            logger.info("Initial balance tracked: %s", self.initial_balance)
         
         return True
     
@@ -325,7 +351,7 @@ class MT5AlertService:
         logger.info("Initializing price level state (marking already-crossed levels as triggered)...")
         
         for symbol, levels in self.price_levels.items():
-            triggered = self.mt5_monitor.check_price_levels(symbol, levels)
+            triggered = self.mt5_monitor.check_price_levels(symbol, self.compiled_levels.get(symbol, levels))
             for alert in triggered:
                 level_key = f"{symbol}_{alert['level_id']}"
                 is_recurring = alert.get('recurring', False)
@@ -333,19 +359,20 @@ class MT5AlertService:
                 # Only mark one-time alerts as triggered (recurring alerts should still fire)
                 if not is_recurring:
                     self.triggered_levels.add(level_key)
-                    logger.debug(f"Marked {level_key} as already triggered (price already crossed)")
+                    logger.debug("Marked %s as already triggered (price already crossed)", level_key)
         
         if self.triggered_levels:
-            logger.info(f"Marked {len(self.triggered_levels)} price level(s) as already triggered on startup")
+            logger.info("Marked %s price level(s) as already triggered on startup", len(self.triggered_levels))
     
-    async def check_trades(self):
-        """Check for new trades and send alerts"""
+    async def check_trades(self, new_trades: Optional[List[Dict]] = None):
+        """Check for new trades and send alerts (new_trades: this tick's apoll positions, fetched if None)"""
         if not self.config.ENABLE_TRADE_ALERTS:
             return
         
-        new_trades = self.mt5_monitor.get_new_positions()
+        if new_trades is None:
+            new_trades = self.mt5_monitor.get_new_positions()
         for trade in new_trades:
-            logger.info(f"New trade detected: {trade.get('symbol')} - {trade.get('type')}")
+            logger.info("New trade detected: %s - %s", trade.get('symbol'), trade.get('type'))
             message = self.telegram.format_trade_alert(trade)
             await self._send_alert_safe(message, alert_type='trade', priority='important')
             
@@ -353,25 +380,28 @@ class MT5AlertService:
             if trade.get('type') == 'CLOSED' and self.trade_db:
                 self._record_trade_to_db(trade)
     
-    async def check_orders(self):
-        """Check for new orders and send alerts"""
+    async def check_orders(self, new_orders: Optional[List[Dict]] = None):
+        """Check for new orders and send alerts (new_orders: this tick's apoll orders, fetched if None)"""
         if not self.config.ENABLE_ORDER_ALERTS:
             return
         
-        new_orders = self.mt5_monitor.get_new_orders()
+        if new_orders is None:
+            new_orders = self.mt5_monitor.get_new_orders()
         for order in new_orders:
-            logger.info(f"New order detected: {order.get('symbol')} - {order.get('type')}")
+            logger.info("New order detected: %s - %s", order.get('symbol'), order.get('type'))
             message = self.telegram.format_order_alert(order)
             await self._send_alert_safe(message, alert_type='order', priority='normal')
     
-    async def check_price_levels(self):
-        """Check if price levels have been reached"""
+    async def check_price_levels(self, prices: Optional[Dict[str, Dict]] = None):
+        """Check if price levels have been reached (prices: this tick's apoll prices, fetched per symbol if None)"""
         if not self.config.ENABLE_PRICE_ALERTS:
             return
         
+        prices = prices or {}
         # Check configured price levels
         for symbol, levels in self.price_levels.items():
-            triggered = self.mt5_monitor.check_price_levels(symbol, levels)
+            triggered = self.mt5_monitor.check_price_levels(symbol, self.compiled_levels.get(symbol, levels),
+                                                            price_info=prices.get(symbol))
             for alert in triggered:
                 level_key = f"{symbol}_{alert['level_id']}"
                 is_recurring = alert.get('recurring', False)
@@ -380,7 +410,7 @@ class MT5AlertService:
                 if not is_recurring and level_key in self.triggered_levels:
                     continue
                 
-                logger.info(f"Price level reached: {symbol} - {alert['level_id']} at {alert['current_price']}")
+                logger.info("Price level reached: %s - %s at %s", symbol, alert['level_id'], alert['current_price'])
                 message = self.telegram.format_price_alert(alert)
                 
                 # Generate price chart if enabled
@@ -393,7 +423,7 @@ class MT5AlertService:
                             highlight_label=f"Level: {alert.get('level_id', 'N/A')}"
                         )
                     except Exception as e:
-                        logger.warning(f"Failed to generate price chart for {symbol}: {e}")
+                        logger.warning("Failed to generate price chart for %s: %s", symbol, e)
                 
                 await self._send_alert_safe(
                     message=message,
@@ -410,17 +440,42 @@ class MT5AlertService:
             
             # Check for level groups
             if self.config.ENABLE_PRICE_LEVEL_GROUPS:
-                triggered_ids = [alert['level_id'] for alert in triggered]
+                triggered_ids = {alert['level_id'] for alert in triggered}
                 if triggered_ids:
                     group_alerts = self.mt5_monitor.check_level_groups(symbol, levels, triggered_ids)
                     for group_alert in group_alerts:
                         group_key = f"{symbol}_group_{group_alert['group_id']}"
                         if group_key not in self.triggered_levels:
-                            logger.info(f"Price level group triggered: {symbol} - {group_alert['group_id']}")
+                            logger.info("Price level group triggered: %s - %s", symbol, group_alert['group_id'])
                             message = self.telegram.format_level_group_alert(group_alert)
                             await self._send_alert_safe(message, alert_type='price_level', priority='important')
                             self.triggered_levels.add(group_key)
     
+    def sweep_expired_levels(self):
+        """Remove expired levels from the price levels and price_levels.json (once per day)"""
+        today = datetime.now().date()
+        if self.last_levels_sweep_date == today:
+            return
+        self.last_levels_sweep_date = today
+        
+        # compiled_levels holds the same level dicts as price_levels, with expirations pre-parsed
+        now_ts = time.time()
+        expired = {id(level) for compiled in self.compiled_levels.values()
+                   for level in compiled.expired_levels(now_ts)}
+        if not expired:
+            return
+        
+        # Swap in a pruned dict (as _apply_level_edit does) so recompiles don't bring them back
+        levels = {}
+        for symbol, symbol_levels in self.price_levels.items():
+            kept = [level for level in symbol_levels if id(level) not in expired]
+            if kept or not symbol_levels:
+                levels[symbol] = kept
+        self.price_levels = levels
+        self.config.save_price_levels(levels)
+        self.compiled_levels = Config.compile_levels(levels)
+        logger.info("Removed %s expired price level(s)", len(expired))
+    
     async def update_monitored_symbols(self):
         """Update list of symbols to monitor based on active positions/orders"""
         active_instruments = self.mt5_monitor.get_active_instruments()
@@ -432,14 +487,14 @@ class MT5AlertService:
         # Update monitored symbols
         new_symbols = active_instruments - self.monitored_symbols
         if new_symbols:
-            logger.info(f"New instruments detected: {', '.join(new_symbols)}")
+            logger.info("New instruments detected: %s", ', '.join(new_symbols))
             self.monitored_symbols.update(new_symbols)
         
         # Log pending orders summary
         pending_by_symbol = self.mt5_monitor.get_pending_orders_by_symbol()
         if pending_by_symbol:
             total_pending = sum(len(orders) for orders in pending_by_symbol.values())
-            logger.info(f"Tracking {total_pending} pending orders across {len(pending_by_symbol)} instruments")
+            logger.info("Tracking %s pending orders across %s instruments", total_pending, len(pending_by_symbol))
     
     async def check_pending_order_proximity(self):
         """Check if prices are approaching pending order levels"""
@@ -457,7 +512,7 @@ class MT5AlertService:
             for alert in alerts:
                 alert_key = f"pending_{alert['ticket']}"
                 if alert_key not in self.triggered_levels:
-                    logger.info(f"Price approaching pending order: {symbol} - {alert['order_type']} at {alert['order_price']} (current: {alert['current_price']}, {alert['distance_pct']}% away)")
+                    logger.info("Price approaching pending order: %s - %s at %s (current: %s, %s%% away)", symbol, alert['order_type'], alert['order_price'], alert['current_price'], alert['distance_pct'])
                     message = self.telegram.format_pending_order_alert(alert)
                     await self._send_alert_safe(message, alert_type='order', priority='normal')
                     self.triggered_levels.add(alert_key)
@@ -478,14 +533,13 @@ class MT5AlertService:
         if self.ml_analyzer and self.config.ENABLE_ML_PROFIT_SUGGESTIONS:
             if self.mt5_monitor and self.mt5_monitor.connected:
                 try:
-                    positions = self.mt5_monitor.get_all_positions()
-                    for pos in positions:
+                    for pos in self.mt5_monitor.iter_all_positions():
                         if pos.get('profit', 0) > 0:
                             ml_suggestion = self.ml_analyzer.get_suggestion(pos, symbol=pos.get('symbol'))
                             if ml_suggestion:
                                 ml_suggestions[pos.get('ticket')] = ml_suggestion
                 except Exception as e:
-                    logger.error(f"Error getting ML suggestions: {e}")
+                    logger.error("Error getting ML suggestions: %s", e)
         
         # Send suggestions
         for suggestion in suggestions:
@@ -506,7 +560,7 @@ class MT5AlertService:
                 else:
                     suggestion['ml_enhanced'] = False
                 
-                logger.info(f"Profit suggestion for {suggestion['symbol']} - Ticket {ticket}: {suggestion['profit']:.2f}")
+                logger.info("Profit suggestion for %s - Ticket %s: %.2f", suggestion['symbol'], ticket, suggestion['profit'])
                 message = self.telegram.format_profit_suggestion(suggestion)
                 await self._send_alert_safe(message, alert_type='risk', priority='normal')
                 self.sent_profit_suggestions.add(suggestion_key)
@@ -528,33 +582,31 @@ class MT5AlertService:
             if account_balance <= 0:
                 return
             
-            # Get positions from MT5
-            import MetaTrader5 as mt5
-            positions = mt5.positions_get()
-            if positions:
-                for pos in positions:
-                    symbol = pos.symbol
-                    volume = pos.volume
+            # Get positions from the monitor's per-tick snapshot
+            positions = self.mt5_monitor.positions()
+            for pos in positions:
+                symbol = pos.symbol
+                volume = pos.volume
                     
-                    if not symbol or volume <= 0:
-                        continue
+                if not symbol or volume <= 0:
+                    continue
                     
-                    # Check if position size is appropriate for current volatility
-                    alert = self.volatility_calc.get_volatility_alert(
-                        symbol=symbol,
-                        current_volume=volume,
-                        account_balance=account_balance
-                    )
+                # Check if position size is appropriate for current volatility
+                alert = self.volatility_calc.get_volatility_alert(
+                    symbol=symbol,
+                    current_volume=volume,
+                    account_balance=account_balance
+                )
                     
-                    if alert:
-                        alert_key = f"volatility_{symbol}_{pos.ticket}"
-                        if alert_key not in self.sent_risk_alerts:
-                            logger.info(f"Volatility position sizing alert for {symbol}")
-                            message = self.telegram.format_volatility_alert(alert)
-                            await self._send_alert_safe(message, alert_type='risk', priority='normal')
-                            self.sent_risk_alerts.add(alert_key)
+                if alert:
+                    alert_key = f"volatility_{symbol}_{pos.ticket}"
+                    if alert_key not in self.sent_risk_alerts:
+                        logger.info("Volatility position sizing alert for %s", symbol)
+                        message = self.telegram.format_volatility_alert(alert)
+                        await self._send_alert_safe(message, alert_type='risk', priority='normal')
+                        self.sent_risk_alerts.add(alert_key)
         except Exception as e:
-            logger.error(f"Error checking volatility position sizing: {e}")
+            logger.error("Error checking volatility position sizing: %s", e)
     
     async def check_risk_alerts(self):
         """Check for risk management alerts"""
@@ -570,7 +622,7 @@ class MT5AlertService:
         if margin_alert:
             alert_key = f"margin_{margin_alert['type']}_{margin_alert['margin_level']:.1f}"
             if alert_key not in self.sent_risk_alerts:
-                logger.warning(f"Margin {margin_alert['type']} alert: {margin_alert['margin_level']:.2f}%")
+                logger.warning("Margin %s alert: %.2f%%", margin_alert['type'], margin_alert['margin_level'])
                 message = self.telegram.format_margin_alert(margin_alert)
                 priority = 'critical' if margin_alert['type'] == 'critical' else 'important'
                 await self._send_alert_safe(message, alert_type='risk', priority=priority)
@@ -583,7 +635,7 @@ class MT5AlertService:
         for alert in position_alerts:
             alert_key = f"position_size_{alert['ticket']}"
             if alert_key not in self.sent_risk_alerts:
-                logger.warning(f"Position size warning: {alert['symbol']} - {alert['position_size_pct']:.2f}%")
+                logger.warning("Position size warning: %s - %.2f%%", alert['symbol'], alert['position_size_pct'])
                 message = self.telegram.format_position_size_alert(alert)
                 await self._send_alert_safe(message, alert_type='risk', priority='important')
                 self.sent_risk_alerts.add(alert_key)
@@ -597,7 +649,7 @@ class MT5AlertService:
             if loss_alert:
                 alert_key = f"daily_loss_{loss_alert['type']}"
                 if alert_key not in self.sent_risk_alerts:
-                    logger.warning(f"Daily loss limit alert: {loss_alert.get('loss_pct', loss_alert.get('daily_loss', 0))}")
+                    logger.warning("Daily loss limit alert: %s", loss_alert.get('loss_pct', loss_alert.get('daily_loss', 0)))
                     message = self.telegram.format_daily_loss_alert(loss_alert)
                     await self._send_alert_safe(message, alert_type='risk', priority='critical')
                     self.sent_risk_alerts.add(alert_key)
@@ -606,12 +658,12 @@ class MT5AlertService:
         if self.config.DRAWDOWN_LIMIT_PCT > 0 and self.initial_balance:
             drawdown_alert = self.mt5_monitor.check_drawdown(
                 drawdown_limit_pct=self.config.DRAWDOWN_LIMIT_PCT,
-                initial_balance=self.initial_balance
+                initial_balance=None if self.config.DRAWDOWN_FROM_PEAK else self.initial_balance
             )
             if drawdown_alert:
                 alert_key = f"drawdown_{drawdown_alert['drawdown_pct']:.1f}"
                 if alert_key not in self.sent_risk_alerts:
-                    logger.warning(f"Drawdown alert: {drawdown_alert['drawdown_pct']:.2f}%")
+                    logger.warning("Drawdown alert: %.2f%%", drawdown_alert['drawdown_pct'])
                     message = self.telegram.format_drawdown_alert(drawdown_alert)
                     await self._send_alert_safe(message, alert_type='risk', priority='important')
                     self.sent_risk_alerts.add(alert_key)
@@ -698,13 +750,13 @@ class MT5AlertService:
         
         # Check quiet hours
         if self.quiet_hours.should_suppress_alert(priority):
-            logger.debug(f"Alert suppressed due to quiet hours: {alert_type}")
+            logger.debug("Alert suppressed due to quiet hours: %s", alert_type)
             return False
         
         # Check rate limiting
         if self.config.ENABLE_ALERT_RATE_LIMITING:
             if not self.rate_limiter.can_send_alert():
-                logger.warning(f"Alert rate limit exceeded, dropping alert: {alert_type}")
+                logger.warning("Alert rate limit exceeded, dropping alert: %s", alert_type)
                 return False
         
         # Handle grouping (only for text-only, non-critical alerts)
@@ -747,7 +799,7 @@ class MT5AlertService:
                         return True
             else:
                 # Waiting for more alerts in batch
-                logger.debug(f"Alert queued for batching: {alert_type}")
+                logger.debug("Alert queued for batching: %s", alert_type)
                 return True
         else:
             # Send immediately (critical alerts, grouping disabled, or with images)
@@ -800,6 +852,42 @@ class MT5AlertService:
         
         return message
     
+    def toggle_level_manager(self):
+        """Open the interactive price level menu alongside monitoring, or close it if open"""
+        if self._level_manager_task and not self._level_manager_task.done():
+            self._level_manager_task.cancel()
+            logger.info("Price level manager closed")
+            return
+        
+        self._level_manager_task = asyncio.ensure_future(self._run_level_manager())
+        logger.info("Price level manager opened")
+    
+    async def _run_level_manager(self):
+        """Run the price level menu on copies of the live levels, merging each edit as it is made"""
+        from ..utils import manage_levels
+        try:
+            await manage_levels.main(get_levels=lambda: copy.deepcopy(self.price_levels),
+                                     on_change=self._apply_level_edit)
+        except Exception as e:
+            logger.error("Price level manager failed: %s", e)
+    
+    def _apply_level_edit(self, symbol: str, symbol_levels: List[Dict]):
+        """
+        Merge one symbol's edited levels into the live price levels, then save and recompile
+        
+        Only the edited symbol is replaced, so dynamic level updates made to other symbols
+        while the menu was open are kept. The live dict is swapped rather than edited in
+        place, so a check_price_levels loop suspended mid-iteration keeps walking the old dict.
+        """
+        levels = dict(self.price_levels)
+        if symbol_levels:
+            levels[symbol] = copy.deepcopy(symbol_levels)
+        else:
+            levels.pop(symbol, None)
+        self.price_levels = levels
+        self.config.save_price_levels(levels)
+        self.compiled_levels = Config.compile_levels(levels)
+    
     def set_trailing_stop(self, ticket: int, distance: float):
         """Register a position for software trailing stop management."""
         self.trailing_stops[ticket] = distance
@@ -815,8 +903,7 @@ class MT5AlertService:
         if not self.mt5_monitor or not self.mt5_monitor.connected:
             return
 
-        import MetaTrader5 as mt5
-        positions = mt5.positions_get()
+        positions = self.mt5_monitor.positions()
         if not positions:
             return
 
@@ -849,7 +936,7 @@ class MT5AlertService:
                 result = self.mt5_monitor.set_breakeven(ticket)
                 if result.get('success'):
                     self.breakeven_applied.add(ticket)
-                    logger.info(f"Auto break-even applied: ticket {ticket} ({pos.symbol})")
+                    logger.info("Auto break-even applied: ticket %s (%s)", ticket, pos.symbol)
                     message = (
                         f"🔒 <b>Auto Break-Even Applied</b>\n\n"
                         f"Ticket: <code>{ticket}</code>\n"
@@ -868,7 +955,6 @@ class MT5AlertService:
         if not self.mt5_monitor or not self.mt5_monitor.connected:
             return
 
-        import MetaTrader5 as mt5
         closed_tickets = []
 
         for ticket, distance in list(self.trailing_stops.items()):
@@ -893,17 +979,17 @@ class MT5AlertService:
                 if ideal_sl > 0 and ideal_sl > pos.sl:
                     result = self.mt5_monitor.modify_position(ticket, sl=ideal_sl, tp=None)
                     if result.get('success'):
-                        logger.debug(f"Trailing stop updated: ticket {ticket} SL={ideal_sl}")
+                        logger.debug("Trailing stop updated: ticket %s SL=%s", ticket, ideal_sl)
             else:
                 ideal_sl = round(tick.ask + distance, digits)
                 if pos.sl == 0 or ideal_sl < pos.sl:
                     result = self.mt5_monitor.modify_position(ticket, sl=ideal_sl, tp=None)
                     if result.get('success'):
-                        logger.debug(f"Trailing stop updated: ticket {ticket} SL={ideal_sl}")
+                        logger.debug("Trailing stop updated: ticket %s SL=%s", ticket, ideal_sl)
 
         for ticket in closed_tickets:
             del self.trailing_stops[ticket]
-            logger.info(f"Trailing stop removed for closed position {ticket}")
+            logger.info("Trailing stop removed for closed position %s", ticket)
 
     async def check_grid_dca_alerts(self):
         """Alert when a new position is added to a symbol that already has open positions."""
@@ -924,7 +1010,7 @@ class MT5AlertService:
                     # Only alert if this is an update (not first detection on startup)
                     if prev_count > 0:
                         action = "added to" if current_count > prev_count else "reduced in"
-                        logger.info(f"Grid/DCA update: {group['symbol']} {group['direction']} — {current_count} positions")
+                        logger.info("Grid/DCA update: %s %s — %s positions", group['symbol'], group['direction'], current_count)
                         message = self.telegram.format_grid_dca_alert(group, action)
                         await self._send_alert_safe(message, alert_type='trade', priority='important')
                     else:
@@ -940,7 +1026,7 @@ class MT5AlertService:
                     del self.known_grid_groups[key]
 
         except Exception as e:
-            logger.error(f"Error checking grid/DCA alerts: {e}")
+            logger.error("Error checking grid/DCA alerts: %s", e)
 
     async def check_correlation_alerts(self):
         """Alert when normally-correlated pairs diverge."""
@@ -950,11 +1036,11 @@ class MT5AlertService:
         try:
             alerts = self.correlation_tracker.check_divergences()
             for alert in alerts:
-                logger.info(f"Correlation divergence: {alert['symbol_a']} / {alert['symbol_b']} r={alert['correlation']}")
+                logger.info("Correlation divergence: %s / %s r=%s", alert['symbol_a'], alert['symbol_b'], alert['correlation'])
                 message = self.telegram.format_correlation_alert(alert)
                 await self._send_alert_safe(message, alert_type='risk', priority='important')
         except Exception as e:
-            logger.error(f"Error checking correlation alerts: {e}")
+            logger.error("Error checking correlation alerts: %s", e)
 
     async def check_news_alerts(self):
         """Alert before high-impact economic calendar events."""
@@ -975,9 +1061,9 @@ class MT5AlertService:
                 message = self.telegram.format_news_alert(event)
                 await self._send_alert_safe(message, alert_type='news', priority='important')
                 self.economic_calendar.mark_alerted(event_key)
-                logger.info(f"News alert sent: {event.get('title')} ({event.get('country')}) in {event.get('minutes_until')} min")
+                logger.info("News alert sent: %s (%s) in %s min", event.get('title'), event.get('country'), event.get('minutes_until'))
         except Exception as e:
-            logger.error(f"Error checking news alerts: {e}")
+            logger.error("Error checking news alerts: %s", e)
 
     async def check_daily_summary(self):
         """Check if it's time to send daily performance summary"""
@@ -1015,8 +1101,6 @@ class MT5AlertService:
         if not self.config.ENABLE_DYNAMIC_LEVELS:
             return
         
-        from datetime import timedelta
-        
         now = datetime.now()
         
         # Check if it's time to update (based on configured interval)
@@ -1035,60 +1119,47 @@ class MT5AlertService:
         active_instruments = self.mt5_monitor.get_active_instruments()
         symbols_to_analyze.update(active_instruments)
         
+        # Fetch rates for all symbols concurrently so MT5 latency overlaps
+        rates_futs = {
+            symbol: self.mt5_monitor.aget_rates(
+                symbol,
+                self.config.DYNAMIC_LEVELS_TIMEFRAME,
+                self.config.DYNAMIC_LEVELS_PERIODS
+            )
+            for symbol in symbols_to_analyze
+        }
+        fetched = await asyncio.gather(*rates_futs.values(), return_exceptions=True)
+        rates_by_symbol = dict(zip(rates_futs.keys(), fetched))
+        
         updated_count = 0
-        for symbol in symbols_to_analyze:
+        for symbol, rates in rates_by_symbol.items():
             try:
+                if isinstance(rates, Exception):
+                    raise rates
                 levels = self.mt5_monitor.detect_support_resistance(
                     symbol=symbol,
                     timeframe=self.config.DYNAMIC_LEVELS_TIMEFRAME,
                     periods=self.config.DYNAMIC_LEVELS_PERIODS,
                     min_touches=self.config.DYNAMIC_LEVELS_MIN_TOUCHES,
-                    tolerance_pct=self.config.DYNAMIC_LEVELS_TOLERANCE_PCT
+                    tolerance_pct=self.config.DYNAMIC_LEVELS_TOLERANCE_PCT,
+                    rates=rates
                 )
                 
-                # Add detected levels to price_levels.json
-                if symbol not in self.price_levels:
-                    self.price_levels[symbol] = []
-                
-                # Remove old dynamic levels (those with id starting with "dynamic_")
-                self.price_levels[symbol] = [
-                    level for level in self.price_levels[symbol] 
-                    if not level.get('id', '').startswith('dynamic_')
-                ]
-                
-                # Add new support levels
-                for idx, support_price in enumerate(levels['support']):
-                    self.price_levels[symbol].append({
-                        'id': f'dynamic_support_{idx+1}',
-                        'price': support_price,
-                        'type': 'below',
-                        'description': f'Auto-detected support level #{idx+1}',
-                        'recurring': True,  # Dynamic levels are recurring
-                        'dynamic': True  # Mark as dynamic
-                    })
-                
-                # Add new resistance levels
-                for idx, resistance_price in enumerate(levels['resistance']):
-                    self.price_levels[symbol].append({
-                        'id': f'dynamic_resistance_{idx+1}',
-                        'price': resistance_price,
-                        'type': 'above',
-                        'description': f'Auto-detected resistance level #{idx+1}',
-                        'recurring': True,  # Dynamic levels are recurring
-                        'dynamic': True  # Mark as dynamic
-                    })
+                # Add detected levels to price_levels.json, replacing old dynamic ones
+                self.price_levels[symbol] = merge_dynamic_levels(self.price_levels.get(symbol, []), levels)
                 
                 if levels['support'] or levels['resistance']:
                     updated_count += 1
-                    logger.info(f"Detected {len(levels['support'])} support and {len(levels['resistance'])} resistance levels for {symbol}")
+                    logger.info("Detected %s support and %s resistance levels for %s", len(levels['support']), len(levels['resistance']), symbol)
             
             except Exception as e:
-                logger.error(f"Error detecting levels for {symbol}: {e}")
+                logger.error("Error detecting levels for %s: %s", symbol, e)
         
         if updated_count > 0:
             # Save updated levels
             self.config.save_price_levels(self.price_levels)
-            logger.info(f"Updated dynamic levels for {updated_count} symbols")
+            self.compiled_levels = Config.compile_levels(self.price_levels)
+            logger.info("Updated dynamic levels for %s symbols", updated_count)
         
         self.last_dynamic_levels_update = now
     
@@ -1100,25 +1171,38 @@ class MT5AlertService:
         
         self.running = True
         logger.info("MT5 Alert Service started. Monitoring trades, orders, and price levels...")
-        logger.info(f"Monitoring synthetic indices: {', '.join(self.config.MONITORED_SYMBOLS)}")
+        logger.info("Monitoring synthetic indices: %s", ', '.join(self.config.MONITORED_SYMBOLS))
         
         # Counter for periodic tasks
         check_counter = 0
         
+        # Ticks are scheduled against fixed deadlines so work time doesn't cause drift
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        self._install_signal_handlers(loop)
+        
+        # Open the price level menu now if configured (SIGUSR1 toggles it later where available)
+        if self.config.OPEN_LEVEL_MANAGER_ON_START:
+            self.toggle_level_manager()
+        
         try:
             while self.running:
+                # Fetch positions, orders and level symbol prices concurrently off the loop thread
+                price_symbols = list(self.price_levels) if self.config.ENABLE_PRICE_ALERTS else []
+                poll = await self.mt5_monitor.apoll(price_symbols)
+                
                 # Check trades
-                await self.check_trades()
+                await self.check_trades(poll['positions'])
                 
                 # Check orders
-                await self.check_orders()
+                await self.check_orders(poll['orders'])
                 
                 # Update monitored symbols (every 5 cycles = ~25 seconds)
                 if check_counter % 5 == 0:
                     await self.update_monitored_symbols()
                 
                 # Check price levels for all monitored symbols
-                await self.check_price_levels()
+                await self.check_price_levels(poll['prices'])
                 
                 # Check pending order proximity (every 2 cycles = ~10 seconds)
                 if check_counter % 2 == 0:
@@ -1163,14 +1247,14 @@ class MT5AlertService:
                 if check_counter % 6 == 0:
                     await self.check_connection_health()
                 
-                # Clear old batched alerts periodically
-                if self.config.ENABLE_ALERT_GROUPING and check_counter % 12 == 0:
-                    self.alert_grouper.clear_old_alerts()
-                
                 # Update dynamic levels (every 360 cycles = ~30 minutes)
                 if self.config.ENABLE_DYNAMIC_LEVELS and check_counter % 360 == 0:
                     await self.update_dynamic_levels()
 
+                # Drop expired price levels (checked every 360 cycles, sweeps once per day)
+                if self.config.ENABLE_PRICE_ALERTS and check_counter % 360 == 0:
+                    self.sweep_expired_levels()
+
                 # Clean up economic calendar alerted set (every 360 cycles = ~30 minutes)
                 if self.economic_calendar and check_counter % 360 == 0:
                     self.economic_calendar.clean_old_alerts()
@@ -1179,17 +1263,60 @@ class MT5AlertService:
                 if self.correlation_tracker and check_counter % 360 == 0:
                     self.correlation_tracker.clean_old_alerts()
                 
-                # Wait before next check
-                await asyncio.sleep(self.config.PRICE_CHECK_INTERVAL)
+                # Wait until the next tick deadline
+                deadline += self.config.PRICE_CHECK_INTERVAL
+                delay = deadline - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    # Tick overran the interval - resync instead of bursting to catch up
+                    deadline = loop.time()
+                    await asyncio.sleep(0)
                 check_counter += 1
         
         except KeyboardInterrupt:
             logger.info("Received shutdown signal")
         except Exception as e:
-            logger.error(f"Error in main loop: {e}", exc_info=True)
+            logger.error("Error in main loop: %s", e, exc_info=True)
         finally:
+            self._remove_signal_handlers(loop)
             await self.shutdown()
     
+    def _handle_shutdown_signal(self, signum):
+        """Stop the main loop after the current tick"""
+        logger.info("Received signal %s", signum)
+        self.running = False
+    
+    def _install_signal_handlers(self, loop):
+        """Register shutdown (SIGINT/SIGTERM) and level menu (SIGUSR1) signal handlers"""
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._handle_shutdown_signal, sig)
+            except NotImplementedError:
+                # Windows event loops don't support add_signal_handler
+                signal.signal(sig, lambda signum, frame: self._handle_shutdown_signal(signum))
+        
+        # SIGUSR1 opens/closes the price level menu without stopping the service (POSIX only)
+        if hasattr(signal, 'SIGUSR1'):
+            try:
+                loop.add_signal_handler(signal.SIGUSR1, self.toggle_level_manager)
+                return
+            except NotImplementedError:
+                pass
+        if not self.config.OPEN_LEVEL_MANAGER_ON_START:
+            logger.warning("SIGUSR1 is not available on this platform; set OPEN_LEVEL_MANAGER_ON_START=true "
+                           "to use the price level menu while the service runs")
+    
+    def _remove_signal_handlers(self, loop):
+        """Unregister loop signal handlers installed by _install_signal_handlers"""
+        for sig in (signal.SIGINT, signal.SIGTERM, getattr(signal, 'SIGUSR1', None)):
+            if sig is None:
+                continue
+            try:
+                loop.remove_signal_handler(sig)
+            except NotImplementedError:
+                pass
+    
     async def shutdown(self):
         """Clean shutdown"""
         logger.info("Shutting down...")
@@ -1,7 +1,82 @@
 import os
+from dataclasses import dataclass
+from datetime import datetime
 from dotenv import load_dotenv
 from typing import List, Dict, Tuple
 import json
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Level type codes used in compiled level arrays
+LEVEL_ABOVE = 0
+LEVEL_BELOW = 1
+LEVEL_BOTH = 2
+LEVEL_TYPE_CODES = {'above': LEVEL_ABOVE, 'below': LEVEL_BELOW, 'both': LEVEL_BOTH}
+
+
+@dataclass
+class LevelsArray:
+    """
+    Price levels for one symbol in struct-of-arrays form
+    
+    Levels are sorted by type, then price, so each type occupies a contiguous,
+    price-ascending block: type code t spans bounds[t]:bounds[t + 1].
+    """
+    prices: np.ndarray      # float64, ascending within each type block
+    types: np.ndarray       # int8 level type codes, ascending
+    recurring: np.ndarray   # bool
+    expiration: np.ndarray  # float64 epoch seconds (inf = never expires)
+    order: np.ndarray       # int64 position of each level in the source list
+    levels: List[Dict]      # source level dicts, in the same (sorted) order
+    bounds: np.ndarray = None  # int64 block offsets for type codes 0..LEVEL_BOTH+1
+
+    def __post_init__(self):
+        if self.bounds is None:
+            self.bounds = np.searchsorted(self.types, np.arange(LEVEL_BOTH + 2))
+
+    def block(self, type_code: int) -> Tuple[int, int]:
+        """Get the (start, end) slice holding levels of one type"""
+        return int(self.bounds[type_code]), int(self.bounds[type_code + 1])
+
+    @classmethod
+    def from_levels(cls, levels: List[Dict]) -> 'LevelsArray':
+        """Compile a list of level dicts, skipping levels without a price"""
+        rows = []
+        for idx, level in enumerate(levels):
+            if level.get('price') is None:
+                continue
+            type_code = LEVEL_TYPE_CODES.get(level.get('type', 'both'), -1)
+            rows.append((type_code, float(level['price']), idx, level))
+        rows.sort(key=lambda r: (r[0], r[1]))
+
+        expiration = np.full(len(rows), np.inf, dtype=np.float64)
+        for i, (_, _, _, level) in enumerate(rows):
+            exp = level.get('expiration')
+            if not exp:
+                continue
+            try:
+                if isinstance(exp, str):
+                    expiration[i] = datetime.fromisoformat(exp).timestamp()
+                else:
+                    expiration[i] = float(exp)
+            except (ValueError, TypeError):
+                logger.warning(f"Invalid expiration format for level {level.get('id', 'unknown')}")
+
+        return cls(
+            prices=np.array([r[1] for r in rows], dtype=np.float64),
+            types=np.array([r[0] for r in rows], dtype=np.int8),
+            recurring=np.array([bool(r[3].get('recurring', False)) for r in rows], dtype=bool),
+            expiration=expiration,
+            order=np.array([r[2] for r in rows], dtype=np.int64),
+            levels=[r[3] for r in rows]
+        )
+
+    def expired_levels(self, now_ts: float) -> List[Dict]:
+        """Get the source level dicts that expired at or before now_ts"""
+        return [self.levels[i] for i in np.flatnonzero(self.expiration <= now_ts)]
 
 
 class Config:
@@ -26,6 +101,7 @@ class Config:
         self.ENABLE_TRADE_ALERTS = os.getenv('ENABLE_TRADE_ALERTS', 'true').lower() == 'true'
         self.ENABLE_ORDER_ALERTS = os.getenv('ENABLE_ORDER_ALERTS', 'true').lower() == 'true'
         self.ENABLE_PRICE_ALERTS = os.getenv('ENABLE_PRICE_ALERTS', 'true').lower() == 'true'
+        self.OPEN_LEVEL_MANAGER_ON_START = os.getenv('OPEN_LEVEL_MANAGER_ON_START', 'false').lower() == 'true'
 
         # Synthetic Indices to Monitor (comma-separated)
         self.MONITORED_SYMBOLS = [s.strip() for s in os.getenv(
@@ -56,6 +132,7 @@ class Config:
         self.DAILY_LOSS_LIMIT_PCT = float(os.getenv('DAILY_LOSS_LIMIT_PCT', '5.0'))
         self.DAILY_LOSS_LIMIT_AMOUNT = float(os.getenv('DAILY_LOSS_LIMIT_AMOUNT', '0.0'))
         self.DRAWDOWN_LIMIT_PCT = float(os.getenv('DRAWDOWN_LIMIT_PCT', '10.0'))
+        self.DRAWDOWN_FROM_PEAK = os.getenv('DRAWDOWN_FROM_PEAK', 'true').lower() == 'true'
 
         # Daily Summary Settings
         self.ENABLE_DAILY_SUMMARY = os.getenv('ENABLE_DAILY_SUMMARY', 'true').lower() == 'true'
@@ -100,6 +177,9 @@ class Config:
         # ML-based Profit Suggestions
         self.ENABLE_ML_PROFIT_SUGGESTIONS = os.getenv('ENABLE_ML_PROFIT_SUGGESTIONS', 'true').lower() == 'true'
         self.ML_MIN_TRADES_FOR_LEARNING = int(os.getenv('ML_MIN_TRADES_FOR_LEARNING', '10'))
+        self.ML_LEARNING_WORKERS = int(os.getenv('ML_LEARNING_WORKERS', '0'))  # 0 = analyze symbols serially
+        self.ML_PATTERN_CACHE_PATH = os.getenv('ML_PATTERN_CACHE_PATH', 'data/ml_patterns.pkl')  # empty = don't persist
+        self.ML_PATTERN_CACHE_TTL_HOURS = float(os.getenv('ML_PATTERN_CACHE_TTL_HOURS', '24'))
 
         # Volatility-based Position Sizing
         self.ENABLE_VOLATILITY_POSITION_SIZING = os.getenv('ENABLE_VOLATILITY_POSITION_SIZING', 'true').lower() == 'true'
@@ -147,7 +227,8 @@ class Config:
         # Comma-separated currency codes (e.g. USD,EUR). Leave empty to auto-detect from active positions/symbols.
         self.NEWS_CURRENCIES = [c.strip().upper() for c in os.getenv('NEWS_CURRENCIES', '').split(',') if c.strip()]
 
-    def load_price_levels(self) -> Dict[str, List[Dict]]:
+    @staticmethod
+    def load_price_levels() -> Dict[str, List[Dict]]:
         """Load price level configurations from JSON file"""
         paths = ['data/price_levels.json', 'price_levels.json']
         for path in paths:
@@ -159,7 +240,14 @@ class Config:
                     print(f"Error loading {path}: {e}")
         return {}
 
-    def save_price_levels(self, levels: Dict[str, List[Dict]]):
+    @staticmethod
+    def compile_levels(levels: Dict[str, List[Dict]]) -> Dict[str, LevelsArray]:
+        """Compile per-symbol price levels into sorted arrays for fast checking"""
+        return {symbol: LevelsArray.from_levels(symbol_levels)
+                for symbol, symbol_levels in levels.items()}
+
+    @staticmethod
+    def save_price_levels(levels: Dict[str, List[Dict]]):
         """Save price level configurations to JSON file"""
         os.makedirs('data', exist_ok=True)
         try:
@@ -0,0 +1,46 @@
+"""
+Shared helpers for editing price level configurations
+"""
+from typing import Dict, List
+
+
+def merge_dynamic_levels(symbol_levels: List[Dict], detected: Dict[str, List[float]]) -> List[Dict]:
+    """
+    Replace auto-detected levels for a symbol with a fresh detection result
+    
+    Args:
+        symbol_levels: Existing levels for the symbol
+        detected: Result of MT5Monitor.detect_support_resistance
+    
+    Returns:
+        New level list: manual levels kept, old dynamic levels replaced
+    """
+    # Remove old dynamic levels (those with id starting with "dynamic_")
+    merged = [
+        level for level in symbol_levels
+        if not level.get('id', '').startswith('dynamic_')
+    ]
+    
+    # Add new support levels
+    for idx, price in enumerate(detected['support'], 1):
+        merged.append({
+            'id': f'dynamic_support_{idx}',
+            'price': price,
+            'type': 'below',
+            'description': f'Auto-detected support level #{idx}',
+            'recurring': True,  # Dynamic levels are recurring
+            'dynamic': True  # Mark as dynamic
+        })
+    
+    # Add new resistance levels
+    for idx, price in enumerate(detected['resistance'], 1):
+        merged.append({
+            'id': f'dynamic_resistance_{idx}',
+            'price': price,
+            'type': 'above',
+            'description': f'Auto-detected resistance level #{idx}',
+            'recurring': True,  # Dynamic levels are recurring
+            'dynamic': True  # Mark as dynamic
+        })
+    
+    return merged
@@ -2,10 +2,69 @@
 """
 Utility script to manage price levels interactively
 """
+import asyncio
+import concurrent.futures
 import json
+import os
 import sys
+import threading
 from datetime import datetime, timedelta
 from .config import Config
+from .levels_utils import merge_dynamic_levels
+
+
+# Pending stdin read left behind by a cancelled prompt; the next prompt takes its line
+_pending_line = None
+
+
+def _read_line(future: concurrent.futures.Future, prompt: str):
+    """Print prompt and read one line from the stdin file descriptor into future"""
+    try:
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+        # Raw byte-at-a-time reads: nothing past the newline is consumed, and no stdin buffer
+        # lock is held that would abort interpreter shutdown while this thread is blocked
+        fd = sys.stdin.fileno()
+        chunks = []
+        while True:
+            chunk = os.read(fd, 1)
+            if not chunk:
+                if not chunks:
+                    raise EOFError
+                break
+            if chunk == b'\n':
+                break
+            chunks.append(chunk)
+        line = b''.join(chunks).decode(sys.stdin.encoding or 'utf-8', errors='replace')
+        future.set_result(line.rstrip('\r'))
+    except BaseException as e:
+        future.set_exception(e)
+
+
+async def ainput(prompt: str = '') -> str:
+    """
+    Read a line from stdin without blocking the running event loop
+    
+    The read runs on a daemon thread, so a prompt that is cancelled (menu closed) never
+    holds up event loop or interpreter shutdown. Raises EOFError if stdin is closed.
+    """
+    global _pending_line
+    if _pending_line is None:
+        _pending_line = concurrent.futures.Future()
+        threading.Thread(target=_read_line, args=(_pending_line, prompt),
+                         name='ainput', daemon=True).start()
+    else:
+        # A cancelled prompt's read is still waiting on stdin; its line answers this prompt
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+    
+    pending = _pending_line
+    try:
+        # Shielded so cancelling this prompt leaves the read for the next one
+        return await asyncio.shield(asyncio.wrap_future(pending))
+    finally:
+        if pending.done():
+            _pending_line = None
 
 
 def load_levels():
@@ -25,41 +84,47 @@ def display_levels(levels):
         print("No price levels configured.")
         return
     
-    print("\n=== Current Price Levels ===\n")
+    # Build the whole listing and write it once rather than printing line by line
+    lines = ["", "=== Current Price Levels ===", ""]
     for symbol, symbol_levels in levels.items():
-        print(f"Symbol: {symbol}")
+        lines.append(f"Symbol: {symbol}")
         for level in symbol_levels:
-            print(f"  - ID: {level.get('id', 'N/A')}")
-            print(f"    Price: {level.get('price', 'N/A')}")
-            print(f"    Type: {level.get('type', 'both')}")
-            print(f"    Description: {level.get('description', 'N/A')}")
-            if level.get('expiration'):
-                print(f"    Expiration: {level.get('expiration')}")
-            if level.get('recurring'):
-                print(f"    Alert Type: 🔄 Recurring")
+            get = level.get
+            lines.append(f"  - ID: {get('id', 'N/A')}")
+            lines.append(f"    Price: {get('price', 'N/A')}")
+            lines.append(f"    Type: {get('type', 'both')}")
+            lines.append(f"    Description: {get('description', 'N/A')}")
+            expiration = get('expiration')
+            if expiration:
+                lines.append(f"    Expiration: {expiration}")
+            if get('recurring'):
+                lines.append("    Alert Type: 🔄 Recurring")
             else:
-                print(f"    Alert Type: ⚡ One-time")
-            if level.get('group'):
-                print(f"    Group: {level.get('group')}")
-            print()
-        print("-" * 40)
-        print()
+                lines.append("    Alert Type: ⚡ One-time")
+            group = get('group')
+            if group:
+                lines.append(f"    Group: {group}")
+            lines.append("")
+        lines.append("-" * 40)
+        lines.append("")
+    
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 
-def add_level(levels):
+async def add_level(levels):
     """Add a new price level"""
-    symbol = input("Enter symbol (e.g., EURUSD): ").upper().strip()
+    symbol = (await ainput("Enter symbol (e.g., EURUSD): ")).upper().strip()
     if not symbol:
         print("Symbol cannot be empty!")
         return
     
-    level_id = input("Enter level ID (unique identifier): ").strip()
+    level_id = (await ainput("Enter level ID (unique identifier): ")).strip()
     if not level_id:
         print("Level ID cannot be empty!")
         return
     
     try:
-        price = float(input("Enter price level: "))
+        price = float(await ainput("Enter price level: "))
     except ValueError:
         print("Invalid price value!")
         return
@@ -68,27 +133,27 @@ def add_level(levels):
     print("  1. above - Alert when price goes above")
     print("  2. below - Alert when price goes below")
     print("  3. both - Alert when price reaches exactly")
-    type_choice = input("Choose type (1/2/3) [default: 3]: ").strip()
+    type_choice = (await ainput("Choose type (1/2/3) [default: 3]: ")).strip()
     
     type_map = {'1': 'above', '2': 'below', '3': 'both'}
     level_type = type_map.get(type_choice, 'both')
     
-    description = input("Enter description (optional): ").strip()
+    description = (await ainput("Enter description (optional): ")).strip()
     
     # Alert type (one-time vs recurring)
     print("\nAlert type:")
     print("  1. One-time - Alert only once when level is reached")
     print("  2. Recurring - Alert every time level is reached")
-    alert_choice = input("Choose alert type (1/2) [default: 1]: ").strip()
+    alert_choice = (await ainput("Choose alert type (1/2) [default: 1]: ")).strip()
     recurring = (alert_choice == '2')
     
     # Expiration date
     expiration = None
-    exp_choice = input("Add expiration date? (y/n) [default: n]: ").strip().lower()
+    exp_choice = (await ainput("Add expiration date? (y/n) [default: n]: ")).strip().lower()
     if exp_choice == 'y':
         print("Enter expiration date/time:")
         print("Format: YYYY-MM-DD or YYYY-MM-DD HH:MM")
-        exp_input = input("Expiration: ").strip()
+        exp_input = (await ainput("Expiration: ")).strip()
         try:
             if len(exp_input) == 10:  # Date only
                 expiration = datetime.strptime(exp_input, '%Y-%m-%d').isoformat()
@@ -99,9 +164,9 @@ def add_level(levels):
     
     # Group
     group = None
-    group_choice = input("Add to a group? (y/n) [default: n]: ").strip().lower()
+    group_choice = (await ainput("Add to a group? (y/n) [default: n]: ")).strip().lower()
     if group_choice == 'y':
-        group = input("Enter group ID: ").strip()
+        group = (await ainput("Enter group ID: ")).strip()
         if not group:
             group = None
     
@@ -130,23 +195,23 @@ def add_level(levels):
         # Ask for group settings if this is the first level in the group
         group_levels = [l for l in levels[symbol] if l.get('group') == group]
         if not group_levels:
-            group_desc = input(f"Enter group description for '{group}' (optional): ").strip()
+            group_desc = (await ainput(f"Enter group description for '{group}' (optional): ")).strip()
             if group_desc:
                 new_level['group_description'] = group_desc
             try:
-                required_count = int(input("How many levels must trigger to alert? [default: 2]: ").strip() or "2")
+                required_count = int((await ainput("How many levels must trigger to alert? [default: 2]: ")).strip() or "2")
                 new_level['group_required_count'] = required_count
             except ValueError:
                 new_level['group_required_count'] = 2
     
     levels[symbol].append(new_level)
-    save_levels(levels)
     print(f"Added level '{level_id}' for {symbol} at {price}")
+    return symbol
 
 
-def remove_level(levels):
+async def remove_level(levels):
     """Remove a price level"""
-    symbol = input("Enter symbol: ").upper().strip()
+    symbol = (await ainput("Enter symbol: ")).upper().strip()
     if symbol not in levels or not levels[symbol]:
         print(f"No levels configured for {symbol}")
         return
@@ -156,7 +221,7 @@ def remove_level(levels):
         print(f"  {i}. {level.get('id')} - {level.get('price')} ({level.get('type')})")
     
     try:
-        choice = int(input("Enter number to remove: "))
+        choice = int(await ainput("Enter number to remove: "))
         if 1 <= choice <= len(levels[symbol]):
             removed = levels[symbol].pop(choice - 1)
             print(f"Removed level '{removed.get('id')}'")
@@ -164,45 +229,49 @@ def remove_level(levels):
             if not levels[symbol]:
                 del levels[symbol]
             
-            save_levels(levels)
+            return symbol
         else:
             print("Invalid choice!")
     except ValueError:
         print("Invalid input!")
 
 
-def detect_levels(levels):
+async def detect_levels(levels):
     """Auto-detect support/resistance levels for a symbol"""
     try:
         from ..monitoring.mt5_monitor import MT5Monitor
-        from .config import Config
         
         print("\n=== Auto-Detect Support/Resistance Levels ===")
-        symbol = input("Enter symbol to analyze: ").upper().strip()
+        symbol = (await ainput("Enter symbol to analyze: ")).upper().strip()
         if not symbol:
             print("Symbol cannot be empty!")
             return
         
-        # Initialize MT5 monitor
-        monitor = MT5Monitor(
-            login=Config.MT5_LOGIN,
-            password=Config.MT5_PASSWORD,
-            server=Config.MT5_SERVER,
-            path=Config.MT5_PATH
+        # Reuse the running service's MT5 connection if there is one
+        config = Config()
+        monitor = MT5Monitor.get_shared(
+            login=config.MT5_LOGIN,
+            password=config.MT5_PASSWORD,
+            server=config.MT5_SERVER,
+            path=config.MT5_PATH
         )
         
-        if not monitor.connect():
+        if monitor is None:
             print("Failed to connect to MT5. Please check your configuration.")
             return
         
         try:
             print(f"\nAnalyzing {symbol}...")
+            # Fetch bars on the monitor's thread pool so a running service keeps ticking
+            rates = await monitor.aget_rates(symbol, config.DYNAMIC_LEVELS_TIMEFRAME,
+                                             config.DYNAMIC_LEVELS_PERIODS)
             detected = monitor.detect_support_resistance(
                 symbol=symbol,
-                timeframe=Config.DYNAMIC_LEVELS_TIMEFRAME,
-                periods=Config.DYNAMIC_LEVELS_PERIODS,
-                min_touches=Config.DYNAMIC_LEVELS_MIN_TOUCHES,
-                tolerance_pct=Config.DYNAMIC_LEVELS_TOLERANCE_PCT
+                timeframe=config.DYNAMIC_LEVELS_TIMEFRAME,
+                periods=config.DYNAMIC_LEVELS_PERIODS,
+                min_touches=config.DYNAMIC_LEVELS_MIN_TOUCHES,
+                tolerance_pct=config.DYNAMIC_LEVELS_TOLERANCE_PCT,
+                rates=rates
             )
             
             if not detected['support'] and not detected['resistance']:
@@ -217,41 +286,11 @@ def detect_levels(levels):
             for price in detected['resistance']:
                 print(f"  - Resistance: {price}")
             
-            add_choice = input("\nAdd these levels? (y/n): ").strip().lower()
+            add_choice = (await ainput("\nAdd these levels? (y/n): ")).strip().lower()
             if add_choice == 'y':
-                if symbol not in levels:
-                    levels[symbol] = []
-                
-                # Remove old dynamic levels
-                levels[symbol] = [
-                    l for l in levels[symbol] 
-                    if not l.get('id', '').startswith('dynamic_')
-                ]
-                
-                # Add support levels
-                for idx, price in enumerate(detected['support'], 1):
-                    levels[symbol].append({
-                        'id': f'dynamic_support_{idx}',
-                        'price': price,
-                        'type': 'below',
-                        'description': f'Auto-detected support level #{idx}',
-                        'recurring': True,
-                        'dynamic': True
-                    })
-                
-                # Add resistance levels
-                for idx, price in enumerate(detected['resistance'], 1):
-                    levels[symbol].append({
-                        'id': f'dynamic_resistance_{idx}',
-                        'price': price,
-                        'type': 'above',
-                        'description': f'Auto-detected resistance level #{idx}',
-                        'recurring': True,
-                        'dynamic': True
-                    })
-                
-                save_levels(levels)
+                levels[symbol] = merge_dynamic_levels(levels.get(symbol, []), detected)
                 print(f"Added {len(detected['support']) + len(detected['resistance'])} levels for {symbol}")
+                return symbol
         
         finally:
             monitor.disconnect()
@@ -262,38 +301,56 @@ def detect_levels(levels):
         print(f"Error detecting levels: {e}")
 
 
-def main():
-    """Main menu"""
-    levels = load_levels()
+async def main(get_levels=None, on_change=None):
+    """
+    Main menu
     
-    while True:
-        print("\n=== Price Level Manager ===")
-        print("1. Display all levels")
-        print("2. Add new level")
-        print("3. Remove level")
-        print("4. Auto-detect support/resistance levels")
-        print("5. Exit")
-        
-        choice = input("\nChoose an option: ").strip()
-        
-        if choice == '1':
-            display_levels(levels)
-        elif choice == '2':
-            add_level(levels)
-        elif choice == '3':
-            remove_level(levels)
-        elif choice == '4':
-            detect_levels(levels)
-        elif choice == '5':
-            print("Goodbye!")
-            sys.exit(0)
-        else:
-            print("Invalid choice!")
+    Args:
+        get_levels: Optional callable returning a private copy of the current levels. Called
+                    before every menu action so edits start from live state. Loads from file if None.
+        on_change: Optional callback given (symbol, symbol_levels) after every add/remove/detect,
+                   so a running service can merge and save just the edited symbol. If None,
+                   the whole levels dict is saved to file.
+    """
+    if get_levels is None:
+        get_levels = load_levels
+    edit_actions = {'2': add_level, '3': remove_level, '4': detect_levels}
+    
+    try:
+        while True:
+            print("\n=== Price Level Manager ===")
+            print("1. Display all levels")
+            print("2. Add new level")
+            print("3. Remove level")
+            print("4. Auto-detect support/resistance levels")
+            print("5. Exit")
+            
+            choice = (await ainput("\nChoose an option: ")).strip()
+            levels = get_levels()
+            
+            if choice == '1':
+                display_levels(levels)
+            elif choice in edit_actions:
+                symbol = await edit_actions[choice](levels)
+                if symbol is None:
+                    continue
+                if on_change is None:
+                    save_levels(levels)
+                else:
+                    on_change(symbol, levels.get(symbol, []))
+            elif choice == '5':
+                print("Goodbye!")
+                return
+            else:
+                print("Invalid choice!")
+    except EOFError:
+        # stdin is closed (e.g. running detached); no further input can arrive
+        print("\nNo input available, closing price level manager")
 
 
 if __name__ == "__main__":
     try:
-        main()
+        asyncio.run(main())
     except KeyboardInterrupt:
         print("\n\nExiting...")
         sys.exit(0)